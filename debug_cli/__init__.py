@@ -5,10 +5,34 @@ This package provides a command-line interface that captures failed terminal
 commands and provides AI-powered explanations and fix suggestions.
 """
 
-__version__ = "0.1.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from .main import app
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .main import app
+
+    # Resolved from the installed distribution metadata on first access
+    __version__: str
 
 __all__ = ["app", "__version__"]
+
+
+def __getattr__(name: str) -> Any:
+    # Importing the Typer app pulls in typer and rich, so defer it
+    if name == "app":
+        from .main import app
+
+        return app
+    if name == "__version__":
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            value = version("debug-cli")
+        except PackageNotFoundError:
+            # Running from a source tree that was never installed
+            value = "unknown"
+        globals()["__version__"] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,22 @@
+"""Console entry point for the debug tool."""
+
+import sys
+
+_VERSION_ARGS = ("version", "--version", "-V")
+
+
+def run() -> None:
+    """Run the CLI, answering version requests before Typer is imported."""
+    if len(sys.argv) >= 2 and sys.argv[1] in _VERSION_ARGS:
+        from . import __version__
+
+        print(f"debug-cli version {__version__}")
+        return
+
+    from .main import app
+
+    app()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,109 @@
+"""Persistent SQLite cache for explanations."""
+
+import dataclasses
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from ..models.explanation import Explanation, FixSuggestion
+from . import _json
+
+
+def default_cache_path() -> Path:
+    """Get the default location of the explanation cache database."""
+    return Path.home() / ".debug-cli" / "cache.db"
+
+
+class DiskCache:
+    """Stores explanations in SQLite so they survive process restarts."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Database file path, defaults to ~/.debug-cli/cache.db
+
+        Raises:
+            OSError: If the cache directory cannot be created
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.path = Path(path) if path else default_cache_path()
+        # Cached entries hold command lines and error output, which may
+        # contain paths, hostnames or tokens, so keep them owner-only
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.path.touch(mode=0o600, exist_ok=True)
+
+        # Autocommit mode; WAL lets concurrent CLI runs read while one writes
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS explanations "
+            "(key TEXT PRIMARY KEY, expiry REAL NOT NULL, blob BLOB NOT NULL)"
+        )
+        self.purge_expired()
+
+    def get(self, key: str) -> Optional[Explanation]:
+        """
+        Get a cached explanation.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached explanation, or None if missing, expired or unreadable
+        """
+        try:
+            row = self._conn.execute(
+                "SELECT blob FROM explanations WHERE key = ? AND expiry > ?",
+                (key, time.time()),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+
+        if row is None:
+            return None
+
+        try:
+            return _explanation_from_dict(_json.loads(row[0]))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def set(self, key: str, explanation: Explanation, ttl: float) -> None:
+        """
+        Store an explanation.
+
+        Args:
+            key: Cache key
+            explanation: Explanation to store
+            ttl: Time-to-live in seconds
+        """
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO explanations (key, expiry, blob) "
+                "VALUES (?, ?, ?)",
+                (key, time.time() + ttl, _json.dumps(dataclasses.asdict(explanation))),
+            )
+        except sqlite3.Error:
+            pass
+
+    def purge_expired(self) -> None:
+        """Delete expired explanations."""
+        self._conn.execute("DELETE FROM explanations WHERE expiry < ?", (time.time(),))
+
+    def clear(self) -> None:
+        """Delete all cached explanations."""
+        self._conn.execute("DELETE FROM explanations")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+def _explanation_from_dict(data: Dict[str, Any]) -> Explanation:
+    """Rebuild an Explanation from its serialized form."""
+    fix_suggestions = [FixSuggestion(**fix) for fix in data.pop("fix_suggestions")]
+    return Explanation(fix_suggestions=fix_suggestions, **data)
@@ -0,0 +1,29 @@
+"""JSON helpers that use orjson when it is installed."""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize an object to compact UTF-8 encoded JSON."""
+    try:
+        if orjson is not None:
+            return orjson.dumps(obj)
+        # Matches orjson's output byte for byte for the payloads used here
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+    except (TypeError, UnicodeEncodeError):
+        # Lone surrogates, such as undecodable bytes from argv or stderr, are
+        # not valid UTF-8; escape them the way the standard library does
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Deserialize JSON, raising json.JSONDecodeError on invalid input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
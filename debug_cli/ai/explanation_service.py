@@ -1,29 +1,92 @@
 """Service for generating and managing error explanations."""
 
-import json
-from datetime import datetime, timedelta
-from typing import Any, Dict, List
+import asyncio
+import hashlib
+import heapq
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from ..models.command import CommandResult
 from ..models.explanation import Explanation
-from .openai_client import OpenAIClient
+from . import _json
+from .openai_client import MAX_COMPLETION_TOKENS, MAX_TOKENS_PER_COMMAND, OpenAIClient
+
+if TYPE_CHECKING:
+    from ._disk_cache import DiskCache
+
+# Number of commands sent in a single batched request, so that each command
+# keeps its full token budget within the model's output token limit.
+BATCH_SIZE = MAX_COMPLETION_TOKENS // MAX_TOKENS_PER_COMMAND
+
+# Upper bound on in-flight requests to avoid bursting past API rate limits.
+MAX_CONCURRENT_REQUESTS = 10
 
 
 class ExplanationService:
     """Service for generating and caching error explanations."""
 
-    def __init__(self, cache_enabled: bool = True, cache_ttl: int = 3600):
+    def __init__(
+        self,
+        cache_enabled: bool = True,
+        cache_ttl: int = 3600,
+        max_entries: int = 256,
+        persistent_cache: bool = False,
+        cache_path: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: str = "gpt-3.5-turbo",
+    ):
         """
         Initialize the explanation service.
 
         Args:
             cache_enabled: Whether to enable caching
             cache_ttl: Cache time-to-live in seconds
+            max_entries: Maximum number of cached explanations, least recently
+                used entries are evicted first
+            persistent_cache: Whether to also keep explanations in an on-disk
+                SQLite cache that survives between runs
+            cache_path: Location of the on-disk cache, defaults to
+                ~/.debug-cli/cache.db
+            api_key: OpenAI API key, defaults to the OPENAI_API_KEY
+                environment variable
+            model: OpenAI model to use for explanations
         """
         self.cache_enabled = cache_enabled
         self.cache_ttl = cache_ttl
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.openai_client = OpenAIClient()
+        self.max_entries = max_entries
+        # Maps cache key to (monotonic expiry time, cached explanation)
+        self.cache: "OrderedDict[str, Tuple[float, Explanation]]" = OrderedDict()
+        # Min-heap of (expiry time, cache key) used to evict expired entries
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self.persistent_cache = persistent_cache
+        self.cache_path = cache_path
+        self._disk_cache: Optional["DiskCache"] = None
+        self.api_key = api_key
+        self.model = model
+        self._openai_client: Optional[OpenAIClient] = None
+
+    @property
+    def openai_client(self) -> OpenAIClient:
+        """Get the OpenAI client, creating it on first use."""
+        if self._openai_client is None:
+            self._openai_client = OpenAIClient(api_key=self.api_key, model=self.model)
+        return self._openai_client
+
+    @property
+    def disk_cache(self) -> Optional["DiskCache"]:
+        """Get the on-disk cache, opening it on first use."""
+        if self._disk_cache is None and self.cache_enabled and self.persistent_cache:
+            import sqlite3
+
+            from ._disk_cache import DiskCache
+
+            try:
+                self._disk_cache = DiskCache(self.cache_path)
+            except (OSError, sqlite3.Error):
+                # Fall back to the in-memory cache only
+                self.persistent_cache = False
+        return self._disk_cache
 
     def explain_command(self, command_result: CommandResult) -> Explanation:
         """
@@ -37,10 +100,9 @@ class ExplanationService:
         """
         # Check cache first
         cache_key = self._generate_cache_key(command_result)
-        if self.cache_enabled and cache_key in self.cache:
-            cached_data = self.cache[cache_key]
-            if self._is_cache_valid(cached_data):
-                return self._load_from_cache(cached_data)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
 
         # Generate new explanation
         explanation = self.openai_client.generate_explanation(command_result)
@@ -57,94 +119,219 @@ class ExplanationService:
         """
         Generate explanations for multiple failed commands.
 
+        Synchronous wrapper around aexplain_multiple_commands.
+
         Args:
             command_results: List of failed command results to explain
 
         Returns:
-            List of Explanation objects
+            List of Explanation objects, in the same order as the input
         """
-        explanations = []
-        for command_result in command_results:
-            explanation = self.explain_command(command_result)
-            explanations.append(explanation)
+        return asyncio.run(self.aexplain_multiple_commands(command_results))
 
-        return explanations
+    async def aexplain_multiple_commands(
+        self, command_results: List[CommandResult]
+    ) -> List[Explanation]:
+        """
+        Asynchronously generate explanations for multiple failed commands.
+
+        Cached explanations are reused; the remaining commands are sent to the
+        AI in batches of up to BATCH_SIZE commands, with the batches requested
+        concurrently.
+
+        Args:
+            command_results: List of failed command results to explain
+
+        Returns:
+            List of Explanation objects, in the same order as the input
+        """
+        cache_keys, by_key, misses = self._split_cached(command_results)
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        miss_keys = list(misses)
+        batches = [
+            miss_keys[start : start + BATCH_SIZE]
+            for start in range(0, len(miss_keys), BATCH_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(
+                self._aexplain_batch([misses[key] for key in batch], semaphore)
+                for batch in batches
+            )
+        )
+
+        for batch, generated in zip(batches, results):
+            for cache_key, explanation in zip(batch, generated):
+                by_key[cache_key] = explanation
+                if self.cache_enabled:
+                    self._save_to_cache(cache_key, explanation)
+
+        return [by_key[cache_key] for cache_key in cache_keys]
+
+    def explain_commands_with_batch_api(
+        self, command_results: List[CommandResult]
+    ) -> List[Explanation]:
+        """
+        Generate explanations for failed commands through the OpenAI Batch API.
+
+        Cheaper than aexplain_multiple_commands but blocks until the batch job
+        finishes, which may take minutes to hours.
+
+        Args:
+            command_results: List of failed command results to explain
+
+        Returns:
+            List of Explanation objects, in the same order as the input
+        """
+        cache_keys, by_key, misses = self._split_cached(command_results)
+
+        if misses:
+            generated = self.openai_client.generate_explanations_with_batch_api(
+                list(misses.values())
+            )
+            for cache_key, explanation in zip(misses, generated):
+                by_key[cache_key] = explanation
+                if self.cache_enabled:
+                    self._save_to_cache(cache_key, explanation)
+
+        return [by_key[cache_key] for cache_key in cache_keys]
+
+    def _split_cached(
+        self, command_results: List[CommandResult]
+    ) -> Tuple[List[str], Dict[str, Explanation], Dict[str, CommandResult]]:
+        """
+        Look up command results in the cache.
+
+        Identical commands share one cache key, so they are requested once and
+        share the result.
+
+        Returns:
+            Cache key per input, cached explanations by key, and the command
+            results still to be requested by key
+        """
+        cache_keys = [self._generate_cache_key(r) for r in command_results]
+        by_key: Dict[str, Explanation] = {}
+        misses: Dict[str, CommandResult] = {}
+        for cache_key, command_result in zip(cache_keys, command_results):
+            if cache_key in by_key or cache_key in misses:
+                continue
+            cached = self._get_cached(cache_key)
+            if cached is None:
+                misses[cache_key] = command_result
+            else:
+                by_key[cache_key] = cached
+        return cache_keys, by_key, misses
+
+    async def _aexplain_batch(
+        self, command_results: List[CommandResult], semaphore: asyncio.Semaphore
+    ) -> List[Explanation]:
+        """Request explanations for one batch while holding the semaphore."""
+        async with semaphore:
+            return await self.openai_client.agenerate_explanations_batch(
+                command_results
+            )
+
+    def _get_cached(self, cache_key: str) -> Optional[Explanation]:
+        """Return the cached explanation for a key, if present and valid."""
+        if not self.cache_enabled:
+            return None
+
+        entry = self.cache.get(cache_key)
+        if entry is not None:
+            expiry, explanation = entry
+            if expiry > time.monotonic():
+                self.cache.move_to_end(cache_key)
+                return explanation
+            del self.cache[cache_key]
+
+        disk_cache = self.disk_cache
+        if disk_cache is None:
+            return None
+
+        cached = disk_cache.get(cache_key)
+        if cached is not None:
+            self._save_to_memory(cache_key, cached)
+        return cached
 
     def _generate_cache_key(self, command_result: CommandResult) -> str:
         """Generate a cache key for a command result."""
-        # Create a hash based on command text and error output
-        key_data = {
-            "command": command_result.command.text,
-            "stderr": command_result.stderr,
-            "exit_code": command_result.exit_code,
-        }
-        return str(hash(json.dumps(key_data, sort_keys=True)))
-
-    def _is_cache_valid(self, cached_data: Dict[str, Any]) -> bool:
-        """Check if cached data is still valid."""
-        if not cached_data:
-            return False
-
-        cached_time = datetime.fromisoformat(cached_data.get("timestamp", ""))
-        return datetime.now() - cached_time < timedelta(seconds=self.cache_ttl)
-
-    def _load_from_cache(self, cached_data: Dict[str, Any]) -> Explanation:
-        """Load explanation from cache data."""
-        explanation_data = cached_data.get("explanation", {})
-
-        # Reconstruct fix suggestions
-        fix_suggestions = []
-        for fix_data in explanation_data.get("fix_suggestions", []):
-            from ..models.explanation import FixSuggestion
-
-            fix_suggestions.append(FixSuggestion(**fix_data))
-
-        return Explanation(
-            summary=explanation_data.get("summary", ""),
-            detailed_explanation=explanation_data.get("detailed_explanation", ""),
-            root_cause=explanation_data.get("root_cause", ""),
-            fix_suggestions=fix_suggestions,
-            confidence=explanation_data.get("confidence", 0.5),
-            related_errors=explanation_data.get("related_errors"),
-            prevention_tips=explanation_data.get("prevention_tips"),
+        # Create a stable hash based on command text and error output, so keys
+        # are the same across processes regardless of PYTHONHASHSEED. The
+        # literal dict has a fixed insertion order, so no key sorting is needed.
+        payload = _json.dumps(
+            {
+                "command": command_result.command.text,
+                "stderr": command_result.stderr,
+                "exit_code": command_result.exit_code,
+            }
         )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _evict_expired(self) -> None:
+        """Remove expired entries from the cache."""
+        now = time.monotonic()
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expiry, cache_key = heapq.heappop(heap)
+            entry = self.cache.get(cache_key)
+            # Skip heap records left behind by entries saved again later
+            if entry is not None and entry[0] == expiry:
+                del self.cache[cache_key]
 
     def _save_to_cache(self, cache_key: str, explanation: Explanation) -> None:
         """Save explanation to cache."""
-        cache_data = {
-            "timestamp": datetime.now().isoformat(),
-            "explanation": {
-                "summary": explanation.summary,
-                "detailed_explanation": explanation.detailed_explanation,
-                "root_cause": explanation.root_cause,
-                "fix_suggestions": [
-                    {
-                        "description": fix.description,
-                        "command": fix.command,
-                        "explanation": fix.explanation,
-                        "confidence": fix.confidence,
-                    }
-                    for fix in explanation.fix_suggestions
-                ],
-                "confidence": explanation.confidence,
-                "related_errors": explanation.related_errors,
-                "prevention_tips": explanation.prevention_tips,
-            },
-        }
+        # Fallbacks stand in for failed requests; leave them uncached so the
+        # next run asks the AI again
+        if explanation.is_fallback:
+            return
+
+        self._save_to_memory(cache_key, explanation)
+
+        disk_cache = self.disk_cache
+        if disk_cache is not None:
+            disk_cache.set(cache_key, explanation, self.cache_ttl)
+
+    def _save_to_memory(self, cache_key: str, explanation: Explanation) -> None:
+        """Save explanation to the in-memory cache."""
+        expiry = time.monotonic() + self.cache_ttl
+        self.cache[cache_key] = (expiry, explanation)
+        self.cache.move_to_end(cache_key)
+        heapq.heappush(self._expiry_heap, (expiry, cache_key))
 
-        self.cache[cache_key] = cache_data
+        self._evict_expired()
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+
+        # Drop heap records for entries that were evicted or overwritten
+        if len(self._expiry_heap) > 2 * self.max_entries:
+            self._expiry_heap = [
+                (entry_expiry, key) for key, (entry_expiry, _) in self.cache.items()
+            ]
+            heapq.heapify(self._expiry_heap)
 
     def clear_cache(self) -> None:
         """Clear the explanation cache."""
         self.cache.clear()
+        self._expiry_heap.clear()
+
+        disk_cache = self.disk_cache
+        if disk_cache is not None:
+            disk_cache.clear()
+
+    def close(self) -> None:
+        """Close the on-disk cache, if it was opened."""
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
+        self._evict_expired()
         return {
             "cache_enabled": self.cache_enabled,
             "cache_size": len(self.cache),
             "cache_ttl": self.cache_ttl,
-            "valid_entries": sum(
-                1 for data in self.cache.values() if self._is_cache_valid(data)
-            ),
+            "max_entries": self.max_entries,
+            "valid_entries": len(self.cache),
+            "persistent_cache": self.persistent_cache,
         }
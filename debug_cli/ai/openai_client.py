@@ -1,13 +1,95 @@
 """OpenAI API client for generating error explanations."""
 
+import asyncio
 import json
 import os
-from typing import Optional
-
-from openai import OpenAI
+import random
+import re
+import time
+from typing import Any, Dict, Final, List, Optional, cast
 
 from ..models.command import CommandResult
 from ..models.explanation import Explanation, FixSuggestion
+from . import _json
+
+# Attempts made per request before giving up on transient API errors
+MAX_ATTEMPTS = 3
+
+# Completion tokens requested per explained command
+MAX_TOKENS_PER_COMMAND = 1000
+
+# Largest completion budget accepted by the default model (gpt-3.5-turbo)
+MAX_COMPLETION_TOKENS = 4096
+
+# Start of the "explanations" array in a batched response, and the separators
+# between its items
+_EXPLANATIONS_ARRAY: Final = re.compile(r'"explanations"\s*:\s*\[')
+_ITEM_SEPARATORS: Final = ", \t\r\n"
+
+# HTTP statuses below 500 that are worth retrying: request timeout, conflict
+# and rate limit
+_RETRYABLE_STATUS_CODES: Final = frozenset({408, 409, 429})
+
+# Seconds between status checks while waiting on a Batch API job
+BATCH_POLL_INTERVAL = 10.0
+
+# Batch API job states after which no output will arrive
+_BATCH_FAILED_STATES: Final = frozenset({"failed", "expired", "cancelled"})
+
+_SYSTEM_PROMPT: Final = """You are an expert software engineer and system administrator.
+Your job is to analyze failed terminal commands and provide clear, actionable
+explanations and fix suggestions.
+
+When analyzing a failed command, you should:
+1. Identify the root cause of the error
+2. Explain what went wrong in simple terms
+3. Provide specific, actionable fix suggestions
+4. Include confidence levels for your suggestions
+5. Mention any related common errors
+6. Provide prevention tips
+
+Respond with a single JSON object only, with no markdown fences or other text.
+Use the following structure:
+{
+    "summary": "Brief summary of what went wrong",
+    "detailed_explanation": "Detailed explanation of the error",
+    "root_cause": "Root cause analysis",
+    "fix_suggestions": [
+        {
+            "description": "Description of the fix",
+            "command": "Suggested command (if applicable)",
+            "explanation": "Why this fix works",
+            "confidence": 0.9
+        }
+    ],
+    "confidence": 0.8,
+    "related_errors": ["List of related common errors"],
+    "prevention_tips": ["Tips to prevent similar errors"]
+}
+
+When asked to analyze several commands at once, respond with a JSON object of
+the form {"explanations": [...]} whose array holds one such object per
+command, in the same order as the commands."""
+
+
+# Layout of a failed command's details inside user prompts
+_COMMAND_TEMPLATE: Final = """Command: {command}
+Working Directory: {working_directory}
+Shell: {shell}
+Exit Code: {exit_code}
+
+Error Output:
+{stderr}
+
+Standard Output:
+{stdout}"""
+
+_USER_TEMPLATE: Final = (
+    "Please analyze this failed command and provide an explanation:\n\n"
+    + _COMMAND_TEMPLATE
+    + "\n\nPlease provide a detailed analysis and fix suggestions in the JSON "
+    "format\nspecified in the system prompt."
+)
 
 
 class OpenAIClient:
@@ -27,8 +109,16 @@ class OpenAIClient:
                 "OpenAI API key is required. Set OPENAI_API_KEY environment variable."
             )
 
-        self.client = OpenAI(api_key=self.api_key)
+        # Imported here so that loading this module does not pull in the
+        # openai/httpx stack until a client is actually needed
+        from openai import AsyncOpenAI, OpenAI
+
+        # Retries are handled by _complete/_acomplete, not by the SDK
+        self.client = OpenAI(api_key=self.api_key, max_retries=0)
+        self.aclient = AsyncOpenAI(api_key=self.api_key, max_retries=0)
         self.model = model
+        # Cleared when the model rejects JSON mode, e.g. gpt-4
+        self.json_mode = True
 
     def generate_explanation(self, command_result: CommandResult) -> Explanation:
         """
@@ -43,17 +133,30 @@ class OpenAIClient:
         prompt = self._build_prompt(command_result)
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.3,
-                max_tokens=1000,
-            )
+            content = self._complete(prompt, max_tokens=MAX_TOKENS_PER_COMMAND)
+            if content is None:
+                return self._create_fallback_explanation(
+                    command_result, "No content in AI response"
+                )
+            return self._parse_response(content, command_result)
+
+        except Exception as e:
+            return self._create_fallback_explanation(command_result, str(e))
 
-            content = response.choices[0].message.content
+    async def agenerate_explanation(self, command_result: CommandResult) -> Explanation:
+        """
+        Asynchronously generate an AI explanation for a failed command.
+
+        Args:
+            command_result: The failed command result to explain
+
+        Returns:
+            Explanation object with AI-generated analysis
+        """
+        prompt = self._build_prompt(command_result)
+
+        try:
+            content = await self._acomplete(prompt, max_tokens=MAX_TOKENS_PER_COMMAND)
             if content is None:
                 return self._create_fallback_explanation(
                     command_result, "No content in AI response"
@@ -63,99 +166,333 @@ class OpenAIClient:
         except Exception as e:
             return self._create_fallback_explanation(command_result, str(e))
 
-    def _get_system_prompt(self) -> str:
-        """Get the system prompt for the AI."""
-        return """You are an expert software engineer and system administrator.
-Your job is to analyze failed terminal commands and provide clear, actionable
-explanations and fix suggestions.
+    async def agenerate_explanations_batch(
+        self, command_results: List[CommandResult]
+    ) -> List[Explanation]:
+        """
+        Asynchronously generate explanations for several commands in one request.
 
-When analyzing a failed command, you should:
-1. Identify the root cause of the error
-2. Explain what went wrong in simple terms
-3. Provide specific, actionable fix suggestions
-4. Include confidence levels for your suggestions
-5. Mention any related common errors
-6. Provide prevention tips
+        Args:
+            command_results: The failed command results to explain
 
-Format your response as a JSON object with the following structure:
-{
-    "summary": "Brief summary of what went wrong",
-    "detailed_explanation": "Detailed explanation of the error",
-    "root_cause": "Root cause analysis",
-    "fix_suggestions": [
-        {
-            "description": "Description of the fix",
-            "command": "Suggested command (if applicable)",
-            "explanation": "Why this fix works",
-            "confidence": 0.9
-        }
-    ],
-    "confidence": 0.8,
-    "related_errors": ["List of related common errors"],
-    "prevention_tips": ["Tips to prevent similar errors"]
-}"""
+        Returns:
+            List of Explanation objects, in the same order as the input
+        """
+        if not command_results:
+            return []
+        if len(command_results) == 1:
+            return [await self.agenerate_explanation(command_results[0])]
 
-    def _build_prompt(self, command_result: CommandResult) -> str:
-        """Build the user prompt for the AI."""
-        prompt = f"""Please analyze this failed command and provide an explanation:
+        prompt = self._build_batch_prompt(command_results)
 
-Command: {command_result.command.text}
-Working Directory: {command_result.command.working_directory or 'Unknown'}
-Shell: {command_result.command.shell or 'Unknown'}
-Exit Code: {command_result.exit_code}
+        try:
+            content = await self._acomplete(
+                prompt, max_tokens=_batch_max_tokens(len(command_results))
+            )
+        except Exception as e:
+            return self._create_fallback_explanations(command_results, str(e))
 
-Error Output:
-{command_result.stderr}
+        if content is None:
+            explanations = self._create_fallback_explanations(
+                command_results, "No content in AI response"
+            )
+        else:
+            explanations = self._parse_batch_response(content, command_results)
 
-Standard Output:
-{command_result.stdout}
+        # Ask again, one command per request, for the commands the batched
+        # response left out or got wrong
+        failed = [
+            i for i, explanation in enumerate(explanations) if explanation.is_fallback
+        ]
+        retried = await asyncio.gather(
+            *(self.agenerate_explanation(command_results[i]) for i in failed)
+        )
+        for i, explanation in zip(failed, retried):
+            explanations[i] = explanation
+        return explanations
+
+    def generate_explanations_with_batch_api(
+        self, command_results: List[CommandResult]
+    ) -> List[Explanation]:
+        """
+        Generate AI explanations through the OpenAI Batch API.
+
+        Batch jobs cost half as much as realtime requests but may take minutes
+        to hours to finish; this call blocks until the job is done.
+
+        Args:
+            command_results: The failed command results to explain
+
+        Returns:
+            List of Explanation objects, in the same order as the input
+        """
+        if not command_results:
+            return []
+
+        try:
+            batch_id = self.submit_batch(command_results)
+            return self.wait_for_batch(batch_id, command_results)
+
+        except Exception as e:
+            return self._create_fallback_explanations(command_results, str(e))
 
-Please provide a detailed analysis and fix suggestions in the JSON format
-specified in the system prompt."""
+    def submit_batch(self, command_results: List[CommandResult]) -> str:
+        """
+        Upload one chat completion request per command as a Batch API job.
 
-        return prompt
+        Args:
+            command_results: The failed command results to explain
+
+        Returns:
+            ID of the created batch job
+        """
+        lines = [
+            _json.dumps(
+                {
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._request_kwargs(
+                        self._build_prompt(command_result),
+                        max_tokens=MAX_TOKENS_PER_COMMAND,
+                    ),
+                }
+            )
+            for i, command_result in enumerate(command_results)
+        ]
+        batch_file = self.client.files.create(
+            file=("requests.jsonl", b"\n".join(lines)), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return str(batch.id)
+
+    def wait_for_batch(
+        self,
+        batch_id: str,
+        command_results: List[CommandResult],
+        poll_interval: float = BATCH_POLL_INTERVAL,
+    ) -> List[Explanation]:
+        """
+        Poll a Batch API job until it finishes and parse its output.
+
+        Args:
+            batch_id: ID returned by submit_batch
+            command_results: The command results the batch was submitted for
+            poll_interval: Seconds to wait between status checks
+
+        Returns:
+            List of Explanation objects, in the same order as the input
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        while batch.status != "completed":
+            if batch.status in _BATCH_FAILED_STATES:
+                return self._create_fallback_explanations(
+                    command_results, f"Batch {batch_id} {batch.status}"
+                )
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch_id)
+
+        contents: Dict[str, Optional[str]] = {}
+        if batch.output_file_id:
+            output = self.client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if line.strip():
+                    record = _json.loads(line)
+                    contents[record["custom_id"]] = _batch_record_content(record)
+
+        explanations = []
+        for i, command_result in enumerate(command_results):
+            content = contents.get(str(i))
+            if content is None:
+                explanations.append(
+                    self._create_fallback_explanation(
+                        command_result, "No content in batch response"
+                    )
+                )
+            else:
+                explanations.append(self._parse_response(content, command_result))
+        return explanations
+
+    def _complete(self, prompt: str, max_tokens: int) -> Optional[str]:
+        """
+        Run a streamed chat completion, retrying transient errors with backoff.
+
+        Reading stops as soon as the top-level JSON object is complete.
+        """
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                stream = self.client.chat.completions.create(
+                    **self._request_kwargs(prompt, max_tokens), stream=True
+                )
+                buffer = _JsonStreamBuffer()
+                try:
+                    for chunk in stream:
+                        if buffer.feed(_chunk_text(chunk)):
+                            break
+                finally:
+                    stream.close()
+                return buffer.getvalue() or None
+            except Exception as e:
+                if self.json_mode and _rejects_json_mode(e):
+                    # Ask again without JSON mode, relying on the system prompt
+                    self.json_mode = False
+                    continue
+                if attempt == MAX_ATTEMPTS - 1 or not _is_retryable(e):
+                    raise
+                time.sleep(_backoff_delay(attempt))
+        return None
+
+    async def _acomplete(self, prompt: str, max_tokens: int) -> Optional[str]:
+        """Asynchronously run a streamed chat completion, see _complete."""
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                stream = await self.aclient.chat.completions.create(
+                    **self._request_kwargs(prompt, max_tokens), stream=True
+                )
+                buffer = _JsonStreamBuffer()
+                try:
+                    async for chunk in stream:
+                        if buffer.feed(_chunk_text(chunk)):
+                            break
+                finally:
+                    await stream.close()
+                return buffer.getvalue() or None
+            except Exception as e:
+                if self.json_mode and _rejects_json_mode(e):
+                    # Ask again without JSON mode, relying on the system prompt
+                    self.json_mode = False
+                    continue
+                if attempt == MAX_ATTEMPTS - 1 or not _is_retryable(e):
+                    raise
+                await asyncio.sleep(_backoff_delay(attempt))
+        return None
+
+    def _request_kwargs(self, prompt: str, max_tokens: int) -> Dict[str, Any]:
+        """Build the keyword arguments for a chat completion request."""
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.3,
+            "max_tokens": max_tokens,
+        }
+        if self.json_mode:
+            # JSON mode guarantees the response body is a single JSON object
+            kwargs["response_format"] = {"type": "json_object"}
+        return kwargs
+
+    def _build_prompt(self, command_result: CommandResult) -> str:
+        """Build the user prompt for the AI."""
+        return _USER_TEMPLATE.format_map(_prompt_fields(command_result))
+
+    def _build_batch_prompt(self, command_results: List[CommandResult]) -> str:
+        """Build a single user prompt covering several failed commands."""
+        sections = [
+            f"[{i}] " + _COMMAND_TEMPLATE.format_map(_prompt_fields(command_result))
+            for i, command_result in enumerate(command_results, 1)
+        ]
+
+        count = len(command_results)
+        header = (
+            f"Analyze the following {count} failed commands. Return a JSON object "
+            f'whose "explanations" array holds {count} objects in the same schema '
+            "as the system prompt, in order."
+        )
+        return header + "\n\n" + "\n\n".join(sections)
 
     def _parse_response(
         self, content: str, command_result: CommandResult
     ) -> Explanation:
         """Parse the AI response into an Explanation object."""
         try:
-            # Try to extract JSON from the response
-            json_start = content.find("{")
-            json_end = content.rfind("}") + 1
-
-            if json_start != -1 and json_end > json_start:
-                json_str = content[json_start:json_end]
-                data = json.loads(json_str)
-
-                # Parse fix suggestions
-                fix_suggestions = []
-                for fix_data in data.get("fix_suggestions", []):
-                    fix_suggestions.append(
-                        FixSuggestion(
-                            description=fix_data.get("description", ""),
-                            command=fix_data.get("command"),
-                            explanation=fix_data.get("explanation", ""),
-                            confidence=float(fix_data.get("confidence", 0.5)),
-                        )
-                    )
+            data = _json.loads(content)
+            if isinstance(data, dict):
+                return self._explanation_from_data(data)
 
-                return Explanation(
-                    summary=data.get("summary", "Error analysis"),
-                    detailed_explanation=data.get("detailed_explanation", ""),
-                    root_cause=data.get("root_cause", ""),
-                    fix_suggestions=fix_suggestions,
-                    confidence=float(data.get("confidence", 0.5)),
-                    related_errors=data.get("related_errors"),
-                    prevention_tips=data.get("prevention_tips"),
-                )
-
-        except (json.JSONDecodeError, KeyError, ValueError):
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
             pass
 
         # Fallback: create explanation from raw content
         return self._create_fallback_explanation(command_result, content)
 
+    def _parse_batch_response(
+        self, content: str, command_results: List[CommandResult]
+    ) -> List[Explanation]:
+        """
+        Parse a batched AI response into one Explanation per command.
+
+        Each item is checked on its own, so one bad item only replaces that
+        command's explanation with a fallback showing the item's own text.
+        """
+        items = _batch_items(content)
+
+        explanations = []
+        for i, command_result in enumerate(command_results):
+            item = items[i] if i < len(items) else None
+            explanation = None
+            if isinstance(item, dict):
+                try:
+                    explanation = self._explanation_from_data(item)
+                except (KeyError, TypeError, ValueError):
+                    pass
+            if explanation is None:
+                raw = (
+                    "No explanation for this command in the batched response"
+                    if item is None
+                    else _json.dumps(item).decode()
+                )
+                explanation = self._create_fallback_explanation(command_result, raw)
+            explanations.append(explanation)
+
+        return explanations
+
+    def _explanation_from_data(self, data: Dict[str, Any]) -> Explanation:
+        """
+        Build an Explanation from a decoded JSON object.
+
+        Raises:
+            TypeError: If a field has the wrong type, such as a null summary
+            ValueError: If a confidence level is not a number between 0 and 1
+        """
+        fix_suggestions = []
+        for fix_data in _list_field(data, "fix_suggestions", dict) or []:
+            command = fix_data.get("command")
+            if command is not None and not isinstance(command, str):
+                raise TypeError("fix command must be a string")
+            fix_suggestions.append(
+                FixSuggestion(
+                    description=_text_field(fix_data, "description", ""),
+                    command=command,
+                    explanation=_text_field(fix_data, "explanation", ""),
+                    confidence=float(fix_data.get("confidence", 0.5)),
+                )
+            )
+
+        return Explanation(
+            summary=_text_field(data, "summary", "Error analysis"),
+            detailed_explanation=_text_field(data, "detailed_explanation", ""),
+            root_cause=_text_field(data, "root_cause", ""),
+            fix_suggestions=fix_suggestions,
+            confidence=float(data.get("confidence", 0.5)),
+            related_errors=_list_field(data, "related_errors", str),
+            prevention_tips=_list_field(data, "prevention_tips", str),
+        )
+
+    def _create_fallback_explanations(
+        self, command_results: List[CommandResult], error_or_content: str
+    ) -> List[Explanation]:
+        """Create a fallback explanation for each of several commands."""
+        return [
+            self._create_fallback_explanation(command_result, error_or_content)
+            for command_result in command_results
+        ]
+
     def _create_fallback_explanation(
         self, command_result: CommandResult, error_or_content: str
     ) -> Explanation:
@@ -181,4 +518,165 @@ specified in the system prompt."""
                 "Check dependencies",
                 "Try running with verbose flags",
             ],
+            is_fallback=True,
         )
+
+
+def _prompt_fields(command_result: CommandResult) -> Dict[str, Any]:
+    """Get the values substituted into the prompt templates."""
+    command = command_result.command
+    return {
+        "command": command.text,
+        "working_directory": command.working_directory or "Unknown",
+        "shell": command.shell or "Unknown",
+        "exit_code": command_result.exit_code,
+        "stderr": command_result.stderr,
+        "stdout": command_result.stdout,
+    }
+
+
+class _JsonStreamBuffer:
+    """Accumulates streamed text until a complete top-level JSON object is read."""
+
+    def __init__(self) -> None:
+        self._parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> bool:
+        """
+        Add streamed text to the buffer.
+
+        Args:
+            text: The next piece of streamed content
+
+        Returns:
+            True once the top-level JSON object has been closed
+        """
+        for i, char in enumerate(text):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(text[: i + 1])
+                    return True
+
+        self._parts.append(text)
+        return False
+
+    def getvalue(self) -> str:
+        """Get the text accumulated so far, from the first "{" if any."""
+        text = "".join(self._parts)
+        # Without JSON mode the object may follow a markdown fence or prose
+        start = text.find("{")
+        return text[start:] if start > 0 else text
+
+
+def _batch_record_content(record: Dict[str, Any]) -> Optional[str]:
+    """Get the message content from one line of a Batch API output file."""
+    body = (record.get("response") or {}).get("body") or {}
+    choices = body.get("choices") or []
+    if not choices:
+        return None
+    return cast(Optional[str], choices[0]["message"].get("content"))
+
+
+def _text_field(data: Dict[str, Any], key: str, default: str) -> str:
+    """Get a string field from AI output, raising TypeError on other types."""
+    value = data.get(key, default)
+    if not isinstance(value, str):
+        raise TypeError(f"{key} must be a string")
+    return value
+
+
+def _list_field(data: Dict[str, Any], key: str, item_type: type) -> Optional[List[Any]]:
+    """Get an optional list field from AI output, checking each item's type."""
+    value = data.get(key)
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(
+        isinstance(item, item_type) for item in value
+    ):
+        raise TypeError(f"{key} must be a list of {item_type.__name__}")
+    return value
+
+
+def _batch_items(content: str) -> List[Any]:
+    """
+    Decode the items of the "explanations" array in a batched response.
+
+    A response cut off by the token limit is not valid JSON, so its items are
+    then decoded one at a time and the complete ones are kept.
+    """
+    try:
+        data = _json.loads(content)
+    except (json.JSONDecodeError, ValueError):
+        pass
+    else:
+        if isinstance(data, dict) and isinstance(data.get("explanations"), list):
+            return cast(List[Any], data["explanations"])
+        return []
+
+    match = _EXPLANATIONS_ARRAY.search(content)
+    if match is None:
+        return []
+
+    decoder = json.JSONDecoder()
+    items: List[Any] = []
+    position = match.end()
+    while True:
+        while position < len(content) and content[position] in _ITEM_SEPARATORS:
+            position += 1
+        try:
+            item, position = decoder.raw_decode(content, position)
+        except json.JSONDecodeError:
+            return items
+        items.append(item)
+
+
+def _batch_max_tokens(count: int) -> int:
+    """Get the completion budget for a request explaining count commands."""
+    return min(MAX_TOKENS_PER_COMMAND * count, MAX_COMPLETION_TOKENS)
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Extract the content delta from a streamed completion chunk."""
+    if not chunk.choices:
+        return ""
+    return chunk.choices[0].delta.content or ""
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Check whether an API error is transient and worth retrying."""
+    import openai
+
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    # Timeouts, conflicts, rate limits and server-side failures are transient,
+    # as in the SDK's own retry policy; auth and bad request errors are not
+    return isinstance(error, openai.APIStatusError) and (
+        error.status_code in _RETRYABLE_STATUS_CODES or error.status_code >= 500
+    )
+
+
+def _rejects_json_mode(error: Exception) -> bool:
+    """Check whether an API error says the model does not support JSON mode."""
+    import openai
+
+    return isinstance(error, openai.BadRequestError) and "response_format" in str(error)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Get the exponential backoff delay, with jitter, before a retry."""
+    return float(2**attempt) + random.random()  # nosec B311
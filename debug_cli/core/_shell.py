@@ -0,0 +1,18 @@
+"""Shell detection shared by command capture and shell integration."""
+
+import os
+
+# Maps shell executable names to shell types; new shells are one-line additions
+_SHELL_MAP = {
+    "bash": "bash",
+    "zsh": "zsh",
+    "fish": "fish",
+}
+
+
+def detect_shell() -> str:
+    """Detect the current shell type from the SHELL environment variable."""
+    # Match on the executable name only, so directories such as /opt/notbash
+    # cannot cause false matches; splitext drops a Windows ".exe" suffix
+    name = os.path.splitext(os.path.basename(os.environ.get("SHELL", "")))[0]
+    return _SHELL_MAP.get(name, "unknown")
@@ -2,9 +2,60 @@
 
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from ..models.command import Command, CommandResult
+from ._shell import detect_shell
+
+# Demo failed commands returned by the mock history implementation, built once
+_MOCK_COMMANDS: Tuple[CommandResult, ...] = (
+    CommandResult(
+        command=Command(
+            text="python nonexistent_script.py",
+            working_directory="/home/user/project",
+            shell="bash",  # nosec B604
+            exit_code=2,
+        ),
+        stdout="",
+        stderr=(
+            "python: can't open file 'nonexistent_script.py': "
+            "[Errno 2] No such file or directory"
+        ),
+        exit_code=2,
+        execution_time=0.1,
+    ),
+    CommandResult(
+        command=Command(
+            text="npm install missing-package",
+            working_directory="/home/user/project",
+            shell="bash",  # nosec B604
+            exit_code=1,
+        ),
+        stdout="",
+        stderr=(
+            "npm ERR! code E404\nnpm ERR! 404 Not Found - GET "
+            "https://registry.npmjs.org/missing-package"
+        ),
+        exit_code=1,
+        execution_time=2.5,
+    ),
+    CommandResult(
+        command=Command(
+            text="git push origin main",
+            working_directory="/home/user/project",
+            shell="bash",  # nosec B604
+            exit_code=1,
+        ),
+        stdout="",
+        stderr=(
+            "error: failed to push some refs to 'origin'\n"
+            "hint: Updates were rejected because the remote contains work "
+            "that you do\nhint: not have locally."
+        ),
+        exit_code=1,
+        execution_time=1.2,
+    ),
+)
 
 
 class CommandCapture:
@@ -16,6 +67,10 @@ class CommandCapture:
             "zsh": [".zsh_history", ".zshrc"],
             "fish": [".local/share/fish/fish_history"],
         }
+        # Shell executable, read once rather than on every capture
+        self._shell = os.environ.get("SHELL", "unknown")
+        # History file of the current shell, resolved once
+        self._history_path = self._find_history_file(self.get_shell_type())
 
     def get_last_failed_commands(self, count: int = 1) -> List[CommandResult]:
         """
@@ -41,59 +96,15 @@ class CommandCapture:
 
     def _get_mock_failed_commands(self, count: int) -> List[CommandResult]:
         """Mock implementation for demonstration purposes."""
-        mock_commands = [
-            CommandResult(
-                command=Command(
-                    text="python nonexistent_script.py",
-                    working_directory="/home/user/project",
-                    shell="bash",  # nosec B604
-                    exit_code=2,
-                ),
-                stdout="",
-                stderr=(
-                    "python: can't open file 'nonexistent_script.py': "
-                    "[Errno 2] No such file or directory"
-                ),
-                exit_code=2,
-                execution_time=0.1,
-            ),
-            CommandResult(
-                command=Command(
-                    text="npm install missing-package",
-                    working_directory="/home/user/project",
-                    shell="bash",  # nosec B604
-                    exit_code=1,
-                ),
-                stdout="",
-                stderr=(
-                    "npm ERR! code E404\nnpm ERR! 404 Not Found - GET "
-                    "https://registry.npmjs.org/missing-package"
-                ),
-                exit_code=1,
-                execution_time=2.5,
-            ),
-            CommandResult(
-                command=Command(
-                    text="git push origin main",
-                    working_directory="/home/user/project",
-                    shell="bash",  # nosec B604
-                    exit_code=1,
-                ),
-                stdout="",
-                stderr=(
-                    "error: failed to push some refs to 'origin'\n"
-                    "hint: Updates were rejected because the remote contains work "
-                    "that you do\nhint: not have locally."
-                ),
-                exit_code=1,
-                execution_time=1.2,
-            ),
-        ]
-
-        return mock_commands[:count]
+        return list(_MOCK_COMMANDS[:count])
 
     def capture_current_command(
-        self, command_text: str, error_output: str, exit_code: int = 1
+        self,
+        command_text: str,
+        error_output: str,
+        exit_code: int = 1,
+        stdout: str = "",
+        execution_time: Optional[float] = None,
     ) -> CommandResult:
         """
         Capture a command that just failed.
@@ -102,6 +113,8 @@ class CommandCapture:
             command_text: The command that was executed
             error_output: The error output from stderr
             exit_code: The exit code of the command
+            stdout: The standard output of the command, if captured
+            execution_time: How long the command ran in seconds, if known
 
         Returns:
             CommandResult object representing the failed command
@@ -110,40 +123,37 @@ class CommandCapture:
             command=Command(
                 text=command_text,
                 working_directory=os.getcwd(),
-                shell=os.environ.get("SHELL", "unknown"),  # nosec B604
+                shell=self._shell,  # nosec B604
                 exit_code=exit_code,
             ),
-            stdout="",
+            stdout=stdout,
             stderr=error_output,
             exit_code=exit_code,
-            execution_time=None,
+            execution_time=execution_time,
         )
 
     def get_shell_type(self) -> str:
         """Get the current shell type."""
-        shell = os.environ.get("SHELL", "")
-        if "bash" in shell:
-            return "bash"
-        elif "zsh" in shell:
-            return "zsh"
-        elif "fish" in shell:
-            return "fish"
-        else:
-            return "unknown"
+        return detect_shell()
 
     def get_history_file_path(self, shell_type: Optional[str] = None) -> Optional[Path]:
         """
         Get the path to the shell history file.
 
         Args:
-            shell_type: Shell type, defaults to current shell
+            shell_type: Shell type, defaults to current shell, whose history
+                file is resolved once when the CommandCapture is created
 
         Returns:
             Path to history file or None if not found
         """
         if shell_type is None:
-            shell_type = self.get_shell_type()
+            return self._history_path
+
+        return self._find_history_file(shell_type)
 
+    def _find_history_file(self, shell_type: str) -> Optional[Path]:
+        """Find the first existing history file for a shell type."""
         if shell_type not in self.shell_history_files:
             return None
 
@@ -1,10 +1,17 @@
 """Shell integration utilities for command capture and execution."""
 
+import functools
 import os
+import platform
 import subprocess  # nosec B404
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from ._shell import detect_shell
+
+# Initial number of bytes read from the end of the shell history file
+HISTORY_TAIL_BYTES = 64 * 1024
+
 
 class ShellIntegration:
     """Handles shell integration and command execution."""
@@ -15,15 +22,7 @@ class ShellIntegration:
 
     def _detect_shell(self) -> str:
         """Detect the current shell type."""
-        shell = os.environ.get("SHELL", "")
-        if "bash" in shell:
-            return "bash"
-        elif "zsh" in shell:
-            return "zsh"
-        elif "fish" in shell:
-            return "fish"
-        else:
-            return "unknown"
+        return detect_shell()
 
     def _get_history_file(self) -> Optional[Path]:
         """Get the path to the shell history file."""
@@ -44,27 +43,14 @@ class ShellIntegration:
 
     def get_environment_info(self) -> Dict[str, Any]:
         """Get current environment information."""
-        return {
-            "shell": self.shell_type,
-            "shell_path": os.environ.get("SHELL", ""),
-            "working_directory": os.getcwd(),
-            "user": os.environ.get("USER", ""),
-            "home": os.environ.get("HOME", ""),
-            "path": os.environ.get("PATH", ""),
-            "python_version": self._get_python_version(),
-            "os": os.name,
-            "platform": os.uname().sysname if hasattr(os, "uname") else "unknown",
-        }
+        # Everything except the working directory is fixed for the process
+        info = dict(_static_environment_info(self.shell_type))
+        info["working_directory"] = os.getcwd()
+        return info
 
     def _get_python_version(self) -> str:
         """Get the current Python version."""
-        try:
-            result = subprocess.run(  # nosec B603, B607
-                ["python", "--version"], capture_output=True, text=True, timeout=5
-            )
-            return result.stdout.strip()
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return "unknown"
+        return _python_version()
 
     def execute_command(
         self, command: str, timeout: int = 30
@@ -126,19 +112,61 @@ class ShellIntegration:
             return []
 
         try:
-            with open(self.history_file, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-
-            # Get the last N non-empty lines
-            recent_commands = []
-            for line in reversed(lines):
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    recent_commands.append(line)
-                    if len(recent_commands) >= count:
+            with open(self.history_file, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+
+                # Read a window from the end of the file, doubling it until
+                # enough commands are found or the whole file has been read
+                window = HISTORY_TAIL_BYTES
+                while True:
+                    start = max(0, size - window)
+                    f.seek(start)
+                    lines = f.read(size - start).split(b"\n")
+                    if start > 0:
+                        # The first line of the window may be cut off
+                        lines = lines[1:]
+
+                    recent_commands = []
+                    for raw_line in reversed(lines):
+                        raw_line = raw_line.strip()
+                        if raw_line and not raw_line.startswith(b"#"):
+                            recent_commands.append(_strip_zsh_metadata(raw_line))
+                            if len(recent_commands) >= count:
+                                break
+
+                    if len(recent_commands) >= count or start == 0:
                         break
+                    window *= 2
 
-            return list(reversed(recent_commands))
+            return [line.decode("utf-8") for line in reversed(recent_commands)]
 
         except (IOError, UnicodeDecodeError):
             return []
+
+
+def _strip_zsh_metadata(line: bytes) -> bytes:
+    """Strip the ': <timestamp>:<duration>;' prefix of zsh extended history."""
+    if line.startswith(b": ") and b";" in line:
+        return line.split(b";", 1)[1]
+    return line
+
+
+def _python_version() -> str:
+    """Get the version of the running Python interpreter."""
+    return f"Python {platform.python_version()}"
+
+
+@functools.lru_cache(maxsize=None)
+def _static_environment_info(shell_type: str) -> Dict[str, Any]:
+    """Get the environment information that does not change during a run."""
+    return {
+        "shell": shell_type,
+        "shell_path": os.environ.get("SHELL", ""),
+        "user": os.environ.get("USER", ""),
+        "home": os.environ.get("HOME", ""),
+        "path": os.environ.get("PATH", ""),
+        "python_version": _python_version(),
+        "os": os.name,
+        "platform": os.uname().sysname if hasattr(os, "uname") else "unknown",
+    }
@@ -1,15 +1,8 @@
 """Main CLI interface for the debug tool."""
 
-from typing import List, Optional
+from typing import Any, List, Optional
 
 import typer
-from rich.console import Console
-
-from .ai.explanation_service import ExplanationService
-from .core.command_capture import CommandCapture
-from .utils.clipboard import ClipboardManager
-from .utils.config import Config
-from .utils.output_formatter import OutputFormatter
 
 # Initialize Typer app
 app = typer.Typer(
@@ -19,9 +12,6 @@ app = typer.Typer(
     rich_markup_mode="rich",
 )
 
-# Global console for consistent output
-console = Console()
-
 
 @app.command()
 def main(
@@ -48,6 +38,14 @@ def main(
     verbose: bool = typer.Option(
         False, "--verbose", "-v", help="Enable verbose output"
     ),
+    batch: bool = typer.Option(
+        False,
+        "--batch",
+        help="Use the OpenAI Batch API: half the cost, but may take hours",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Ignore and don't store cached explanations"
+    ),
 ) -> None:
     """
     Explain failed terminal commands using AI.
@@ -60,32 +58,51 @@ def main(
         debug --last-n 3         # Explain the last 3 failed commands
         debug --raw              # Get raw AI output
         debug --copy             # Copy explanation to clipboard
+        debug --last-n 20 --batch  # Explain 20 commands via the Batch API
         debug --command "npm install" --error "package not found"
     """
+    # Heavy subsystems are imported here so that help, version and config
+    # do not pay for the AI and HTTP stack
+    from .utils.config import get_config
+
     try:
         # Initialize configuration
-        config = Config()
+        config = get_config()
 
         # Validate configuration
         config_errors = config.validate()
         if config_errors:
-            console.print("[red]Configuration errors:[/red]")
+            typer.secho("Configuration errors:", fg="red")
             for key, error in config_errors.items():
-                console.print(f"  [red]{key}:[/red] {error}")
-            console.print(
-                "\n[yellow]Please set the required environment variables or "
-                "create a .env file.[/yellow]"
+                typer.echo(f"  {typer.style(f'{key}:', fg='red')} {error}")
+            typer.secho(
+                "\nPlease set the required environment variables or "
+                "create a .env file.",
+                fg="yellow",
             )
             raise typer.Exit(1)
 
+        from .ai.explanation_service import ExplanationService
+        from .core.command_capture import CommandCapture
+        from .utils.clipboard import ClipboardManager
+        from .utils.output_formatter import OutputFormatter
+
         # Initialize services
         command_capture = CommandCapture()
-        explanation_service = ExplanationService()
+        explanation_service = ExplanationService(
+            cache_enabled=not no_cache,
+            cache_ttl=config.cache_ttl,
+            persistent_cache=True,
+            api_key=config.openai_api_key,
+            model=config.openai_model,
+        )
         output_formatter = OutputFormatter(enable_colors=config.enable_colors)
         clipboard_manager = ClipboardManager()
 
         if verbose:
-            console.print(f"[blue]Configuration loaded:[/blue] {config.to_dict()}")
+            typer.echo(
+                f"{typer.style('Configuration loaded:', fg='blue')} {config.to_dict()}"
+            )
 
         # Get command results to analyze
         command_results = []
@@ -93,9 +110,7 @@ def main(
         if command:
             # Analyze specific command
             if not error:
-                console.print(
-                    "[red]Error: --error is required when using --command[/red]"
-                )
+                typer.secho("Error: --error is required when using --command", fg="red")
                 raise typer.Exit(1)
 
             command_result = command_capture.capture_current_command(
@@ -107,20 +122,40 @@ def main(
             command_results = command_capture.get_last_failed_commands(count=last_n)
 
             if not command_results:
-                console.print("[yellow]No failed commands found in history.[/yellow]")
-                console.print(
-                    "[blue]Try running a command that fails, then run 'debug' "
-                    "again.[/blue]"
+                typer.secho("No failed commands found in history.", fg="yellow")
+                typer.secho(
+                    "Try running a command that fails, then run 'debug' again.",
+                    fg="blue",
                 )
                 raise typer.Exit(0)
 
         if verbose:
-            console.print(
-                f"[blue]Found {len(command_results)} command(s) to analyze[/blue]"
+            typer.secho(
+                f"Found {len(command_results)} command(s) to analyze", fg="blue"
             )
 
-        # Generate explanations
-        explanations = explanation_service.explain_multiple_commands(command_results)
+        # Generate explanations; several commands are requested concurrently,
+        # a single one skips the event loop and uses the sync client, and
+        # --batch trades latency for cost
+        try:
+            if batch:
+                typer.secho(
+                    "Submitting to the OpenAI Batch API and waiting for results "
+                    "(this may take a while)...",
+                    fg="blue",
+                )
+                explanations = explanation_service.explain_commands_with_batch_api(
+                    command_results
+                )
+            elif len(command_results) > 1:
+                explanations = explanation_service.explain_multiple_commands(
+                    command_results
+                )
+            else:
+                explanations = [explanation_service.explain_command(command_results[0])]
+        finally:
+            # The cache is not needed once explanations are generated
+            explanation_service.close()
 
         # Display explanations
         output_formatter.display_multiple_explanations(explanations, raw_output=raw)
@@ -131,45 +166,50 @@ def main(
                 # Combine all explanations into a single text
                 combined_text = _combine_explanations_for_clipboard(explanations)
                 if clipboard_manager.copy_to_clipboard(combined_text):
-                    console.print("\n[green]Explanation copied to clipboard![/green]")
+                    typer.secho("\nExplanation copied to clipboard!", fg="green")
                 else:
-                    console.print("\n[red]Failed to copy to clipboard[/red]")
+                    typer.secho("\nFailed to copy to clipboard", fg="red")
             else:
-                console.print(
-                    "\n[yellow]Clipboard functionality not available on this "
-                    "system[/yellow]"
+                typer.secho(
+                    "\nClipboard functionality not available on this system",
+                    fg="yellow",
                 )
 
     except KeyboardInterrupt:
-        console.print("\n[yellow]Operation cancelled by user[/yellow]")
+        typer.secho("\nOperation cancelled by user", fg="yellow")
         raise typer.Exit(1)
     except Exception as e:
-        console.print(f"\n[red]An error occurred:[/red] {str(e)}")
+        typer.echo(f"\n{typer.style('An error occurred:', fg='red')} {str(e)}")
         if verbose:
-            console.print_exception()
+            # Rich is only needed for the formatted traceback
+            from rich.console import Console
+
+            Console().print_exception()
         raise typer.Exit(1)
 
 
 @app.command()
 def setup() -> None:
     """Set up shell integration for automatic command capture."""
-    console.print("[blue]Setting up shell integration...[/blue]")
+    typer.secho("Setting up shell integration...", fg="blue")
 
     # This would implement shell integration setup
     # For now, just show instructions
-    console.print("\n[yellow]Shell integration setup is not yet implemented.[/yellow]")
-    console.print("For now, you can use the tool by:")
-    console.print("1. Running a command that fails")
-    console.print("2. Running 'debug' to get an explanation")
-    console.print("\nOr use the --command and --error flags for specific analysis.")
+    typer.secho("\nShell integration setup is not yet implemented.", fg="yellow")
+    typer.echo("For now, you can use the tool by:")
+    typer.echo("1. Running a command that fails")
+    typer.echo("2. Running 'debug' to get an explanation")
+    typer.echo("\nOr use the --command and --error flags for specific analysis.")
 
 
 @app.command()
 def config() -> None:
     """Show current configuration."""
-    config = Config()
+    from .utils.config import get_config
 
-    console.print("[blue]Current Configuration:[/blue]")
+    config = get_config()
+
+    typer.secho("Current Configuration:", fg="blue")
     config_dict = config.to_dict()
 
     # Hide sensitive information
@@ -177,16 +217,16 @@ def config() -> None:
         config_dict["openai_api_key"] = "***" + config_dict["openai_api_key"][-4:]
 
     for key, value in config_dict.items():
-        console.print(f"  [cyan]{key}:[/cyan] {value}")
+        typer.echo(f"  {typer.style(f'{key}:', fg='cyan')} {value}")
 
     # Show validation status
     errors = config.validate()
     if errors:
-        console.print("\n[red]Configuration Issues:[/red]")
+        typer.secho("\nConfiguration Issues:", fg="red")
         for key, error in errors.items():
-            console.print(f"  [red]{key}:[/red] {error}")
+            typer.echo(f"  {typer.style(f'{key}:', fg='red')} {error}")
     else:
-        console.print("\n[green]Configuration is valid![/green]")
+        typer.secho("\nConfiguration is valid!", fg="green")
 
 
 @app.command()
@@ -194,47 +234,56 @@ def version() -> None:
     """Show version information."""
     from . import __version__
 
-    console.print(f"debug-cli version {__version__}")
+    typer.echo(f"debug-cli version {__version__}")
 
 
 def _combine_explanations_for_clipboard(explanations: List) -> str:
     """Combine multiple explanations into a single text for clipboard."""
-    combined = []
+    combined: List[str] = []
+    add = combined.append
+    count = len(explanations)
+    separator = "\n" + "=" * 50 + "\n"
 
     for i, explanation in enumerate(explanations, 1):
-        if len(explanations) > 1:
-            combined.append(f"=== Explanation {i} of {len(explanations)} ===")
+        if count > 1:
+            add(f"=== Explanation {i} of {count} ===")
 
-        combined.append(f"Summary: {explanation.summary}")
-        combined.append(f"Detailed: {explanation.detailed_explanation}")
-        combined.append(f"Root Cause: {explanation.root_cause}")
+        add(f"Summary: {explanation.summary}")
+        add(f"Detailed: {explanation.detailed_explanation}")
+        add(f"Root Cause: {explanation.root_cause}")
 
         if explanation.fix_suggestions:
-            combined.append("\nFix Suggestions:")
-            for j, fix in enumerate(explanation.fix_suggestions, 1):
-                combined.append(f"{j}. {fix.description}")
-                if fix.command:
-                    combined.append(f"   Command: {fix.command}")
-                combined.append(f"   Explanation: {fix.explanation}")
-                combined.append(f"   Confidence: {fix.confidence:.1%}")
+            add("\nFix Suggestions:")
+            add(
+                "\n".join(
+                    _format_fix_for_clipboard(j, fix)
+                    for j, fix in enumerate(explanation.fix_suggestions, 1)
+                )
+            )
 
         if explanation.related_errors:
-            combined.append(
-                f"\nRelated Errors: {', '.join(explanation.related_errors)}"
-            )
+            add(f"\nRelated Errors: {', '.join(explanation.related_errors)}")
 
         if explanation.prevention_tips:
-            combined.append(
-                f"\nPrevention Tips: {', '.join(explanation.prevention_tips)}"
-            )
+            add(f"\nPrevention Tips: {', '.join(explanation.prevention_tips)}")
 
-        combined.append(f"\nOverall Confidence: {explanation.confidence:.1%}")
+        add(f"\nOverall Confidence: {explanation.confidence:.1%}")
 
-        if i < len(explanations):
-            combined.append("\n" + "=" * 50 + "\n")
+        if i < count:
+            add(separator)
 
     return "\n".join(combined)
 
 
+def _format_fix_for_clipboard(index: int, fix: Any) -> str:
+    """Format one numbered fix suggestion for clipboard text."""
+    command = f"\n   Command: {fix.command}" if fix.command else ""
+    return (
+        f"{index}. {fix.description}{command}\n"
+        f"   Explanation: {fix.explanation}\n"
+        f"   Confidence: {fix.confidence:.1%}"
+    )
+
+
 if __name__ == "__main__":
     app()
@@ -1,6 +1,27 @@
 """Data models for the debug CLI application."""
 
-from .command import Command, CommandResult
-from .explanation import Explanation, FixSuggestion
+import importlib
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from .command import Command, CommandResult
+    from .explanation import Explanation, FixSuggestion
 
 __all__ = ["Command", "CommandResult", "Explanation", "FixSuggestion"]
+
+# Submodule defining each exported model, imported on first access
+_LAZY: Dict[str, str] = {
+    "Command": ".command",
+    "CommandResult": ".command",
+    "Explanation": ".explanation",
+    "FixSuggestion": ".explanation",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,9 @@
+"""Compatibility helpers for the data models."""
+
+import sys
+from typing import Any, Dict
+
+# dataclass(slots=True) is only available from Python 3.10
+DATACLASS_OPTIONS: Dict[str, Any] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
@@ -1,35 +1,50 @@
 """Command-related data models."""
 
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from ._compat import DATACLASS_OPTIONS
 
 
-class Command(BaseModel):
-    """Represents a terminal command."""
+@dataclass(**DATACLASS_OPTIONS)
+class Command:
+    """
+    Represents a terminal command.
 
-    text: str = Field(..., description="The command text")
-    timestamp: datetime = Field(
-        default_factory=datetime.now, description="When the command was executed"
-    )
-    working_directory: Optional[str] = Field(
-        None, description="Working directory where command was run"
-    )
-    shell: Optional[str] = Field(None, description="Shell type (bash, zsh, fish, etc.)")
-    exit_code: Optional[int] = Field(None, description="Command exit code")
+    Attributes:
+        text: The command text
+        timestamp: When the command was executed
+        working_directory: Working directory where command was run
+        shell: Shell type (bash, zsh, fish, etc.)
+        exit_code: Command exit code
+    """
 
+    text: str
+    timestamp: datetime = field(default_factory=datetime.now)
+    working_directory: Optional[str] = None
+    shell: Optional[str] = None
+    exit_code: Optional[int] = None
 
-class CommandResult(BaseModel):
-    """Represents the result of executing a command."""
 
-    command: Command = Field(..., description="The executed command")
-    stdout: str = Field(default="", description="Standard output")
-    stderr: str = Field(default="", description="Standard error output")
-    exit_code: int = Field(..., description="Exit code of the command")
-    execution_time: Optional[float] = Field(
-        None, description="Execution time in seconds"
-    )
+@dataclass(**DATACLASS_OPTIONS)
+class CommandResult:
+    """
+    Represents the result of executing a command.
+
+    Attributes:
+        command: The executed command
+        exit_code: Exit code of the command
+        stdout: Standard output
+        stderr: Standard error output
+        execution_time: Execution time in seconds
+    """
+
+    command: Command
+    exit_code: int
+    stdout: str = ""
+    stderr: str = ""
+    execution_time: Optional[float] = None
 
     @property
     def is_successful(self) -> bool:
@@ -44,12 +59,14 @@ class CommandResult(BaseModel):
     @property
     def error_summary(self) -> str:
         """Get a summary of the error output."""
-        if not self.has_error:
+        stderr = self.stderr.strip()
+        if not stderr:
             return ""
 
-        # Take first few lines of stderr for summary
-        lines = self.stderr.strip().split("\n")
+        # Take first few lines of stderr for summary; the bounded split leaves
+        # the rest of a long log as a single unsplit tail
+        lines = stderr.split("\n", 3)
         if len(lines) <= 3:
-            return self.stderr.strip()
+            return stderr
 
         return "\n".join(lines[:3]) + "\n..."
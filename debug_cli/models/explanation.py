@@ -1,46 +1,79 @@
 """Explanation-related data models."""
 
+from dataclasses import dataclass, field
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from ._compat import DATACLASS_OPTIONS
 
 
-class FixSuggestion(BaseModel):
-    """Represents a suggested fix for a command error."""
+def _check_confidence(confidence: float) -> None:
+    """Raise ValueError if a confidence level is outside 0-1."""
+    if not 0.0 <= confidence <= 1.0:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
 
-    description: str = Field(..., description="Description of the fix")
-    command: Optional[str] = Field(None, description="Suggested command to run")
-    explanation: str = Field(..., description="Explanation of why this fix works")
-    confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence level (0-1)")
 
+@dataclass(**DATACLASS_OPTIONS)
+class FixSuggestion:
+    """
+    Represents a suggested fix for a command error.
 
-class Explanation(BaseModel):
-    """Represents an AI-generated explanation for a failed command."""
+    Attributes:
+        description: Description of the fix
+        explanation: Explanation of why this fix works
+        confidence: Confidence level (0-1)
+        command: Suggested command to run
+    """
 
-    summary: str = Field(..., description="Brief summary of what went wrong")
-    detailed_explanation: str = Field(
-        ..., description="Detailed explanation of the error"
-    )
-    root_cause: str = Field(..., description="Root cause analysis")
-    fix_suggestions: List[FixSuggestion] = Field(
-        default_factory=list, description="List of suggested fixes"
-    )
-    confidence: float = Field(
-        ..., ge=0.0, le=1.0, description="Overall confidence level (0-1)"
-    )
-    related_errors: Optional[List[str]] = Field(
-        None, description="Related common errors"
-    )
-    prevention_tips: Optional[List[str]] = Field(
-        None, description="Tips to prevent similar errors"
-    )
+    description: str
+    explanation: str
+    confidence: float
+    command: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        _check_confidence(self.confidence)
+
+
+@dataclass(**DATACLASS_OPTIONS)
+class Explanation:
+    """
+    Represents an AI-generated explanation for a failed command.
+
+    Attributes:
+        summary: Brief summary of what went wrong
+        detailed_explanation: Detailed explanation of the error
+        root_cause: Root cause analysis
+        confidence: Overall confidence level (0-1)
+        fix_suggestions: List of suggested fixes
+        related_errors: Related common errors
+        prevention_tips: Tips to prevent similar errors
+        is_fallback: Whether this is a placeholder for a failed AI request
+    """
+
+    summary: str
+    detailed_explanation: str
+    root_cause: str
+    confidence: float
+    fix_suggestions: List[FixSuggestion] = field(default_factory=list)
+    related_errors: Optional[List[str]] = None
+    prevention_tips: Optional[List[str]] = None
+    is_fallback: bool = False
+
+    def __post_init__(self) -> None:
+        _check_confidence(self.confidence)
 
     @property
     def primary_fix(self) -> Optional[FixSuggestion]:
         """Get the highest confidence fix suggestion."""
-        if not self.fix_suggestions:
+        fixes = self.fix_suggestions
+        if not fixes:
             return None
-        return max(self.fix_suggestions, key=lambda x: x.confidence)
+
+        # Single pass without a key function; ties keep the earliest fix
+        best = fixes[0]
+        for fix in fixes[1:]:
+            if fix.confidence > best.confidence:
+                best = fix
+        return best
 
     @property
     def has_high_confidence(self) -> bool:
@@ -1,7 +1,29 @@
 """Utility functions for the debug CLI."""
 
-from .clipboard import ClipboardManager
-from .config import Config
-from .output_formatter import OutputFormatter
+import importlib
+from typing import TYPE_CHECKING, Any, Dict
 
-__all__ = ["OutputFormatter", "ClipboardManager", "Config"]
+if TYPE_CHECKING:
+    from .clipboard import ClipboardManager
+    from .config import Config, get_config
+    from .output_formatter import OutputFormatter
+
+__all__ = ["OutputFormatter", "ClipboardManager", "Config", "get_config"]
+
+# Submodule defining each exported utility, imported on first access so that
+# loading the config does not pull in Rich
+_LAZY: Dict[str, str] = {
+    "ClipboardManager": ".clipboard",
+    "Config": ".config",
+    "get_config": ".config",
+    "OutputFormatter": ".output_formatter",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
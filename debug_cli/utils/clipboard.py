@@ -1,15 +1,151 @@
 """Clipboard management utilities."""
 
+import functools
+import importlib.util
 import platform
+import shutil
 import subprocess  # nosec B404
-from typing import Optional
+import sys
+from typing import Callable, Dict, List, Optional
+
+# Host platform, resolved once at import
+_SYSTEM = platform.system().lower()
+
+# Seconds to wait for an external clipboard tool before giving up on it
+CLIPBOARD_TIMEOUT = 2
+
+# Win32 clipboard constants
+_CF_UNICODETEXT = 13
+_GMEM_MOVEABLE = 0x0002
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_clipboard_backend() -> Optional[str]:
+    """
+    Find the clipboard backend for this platform.
+
+    The result is cached, so the probe runs at most once per process.
+
+    Returns:
+        Backend name, or None if no clipboard backend is available
+    """
+    if _SYSTEM == "darwin":
+        return "pbcopy" if shutil.which("pbcopy") else None
+    if _SYSTEM == "linux":
+        # Prefer xclip, fall back to xsel
+        for tool in ("xclip", "xsel"):
+            if shutil.which(tool):
+                return tool
+        return None
+    if _SYSTEM == "windows":
+        # Look for pyperclip without importing it
+        if importlib.util.find_spec("pyperclip") is not None:
+            return "pyperclip"
+        return "powershell" if shutil.which("powershell") else None
+    return None
+
+
+def _pipe_to(args: List[str], data: bytes) -> bool:
+    """
+    Run a clipboard tool with data on its stdin.
+
+    Args:
+        args: Command and arguments to run
+        data: Bytes to write to the tool's stdin
+
+    Returns:
+        True if the tool exited successfully, False otherwise
+    """
+    # The tools print nothing on success, so don't allocate output pipes
+    try:
+        result = subprocess.run(  # nosec B603
+            args,
+            input=data,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+            timeout=CLIPBOARD_TIMEOUT,
+        )
+    except subprocess.TimeoutExpired:
+        # run() has already killed the wedged tool
+        return False
+    return result.returncode == 0
+
+
+def _copy_appkit(text: str) -> bool:
+    """Copy text to the macOS pasteboard in-process via PyObjC."""
+    if importlib.util.find_spec("AppKit") is None:
+        return False
+
+    from AppKit import (  # type: ignore[import-not-found]
+        NSPasteboard,
+        NSPasteboardTypeString,
+    )
+
+    pasteboard = NSPasteboard.generalPasteboard()
+    pasteboard.clearContents()
+    return bool(pasteboard.setString_forType_(text, NSPasteboardTypeString))
+
+
+def _copy_win32(text: str) -> bool:
+    """Copy text to the Windows clipboard in-process via the Win32 API."""
+    if sys.platform != "win32":
+        return False
+
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+    kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+    kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+    kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalLock.restype = wintypes.LPVOID
+    kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
+    user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+    user32.SetClipboardData.restype = wintypes.HANDLE
+
+    data = text.encode("utf-16-le") + b"\x00\x00"
+    if not user32.OpenClipboard(None):
+        return False
+    try:
+        user32.EmptyClipboard()
+        handle = kernel32.GlobalAlloc(_GMEM_MOVEABLE, len(data))
+        if not handle:
+            return False
+        pointer = kernel32.GlobalLock(handle)
+        if not pointer:
+            kernel32.GlobalFree(handle)
+            return False
+        ctypes.memmove(pointer, data, len(data))
+        kernel32.GlobalUnlock(handle)
+        # On success the clipboard owns the memory
+        if not user32.SetClipboardData(_CF_UNICODETEXT, handle):
+            kernel32.GlobalFree(handle)
+            return False
+        return True
+    finally:
+        user32.CloseClipboard()
+
+
+# In-process clipboard writers, tried before the external tools
+_NATIVE_COPY: Dict[str, Callable[[str], bool]] = {
+    "darwin": _copy_appkit,
+    "windows": _copy_win32,
+}
 
 
 class ClipboardManager:
     """Handles clipboard operations across different platforms."""
 
     def __init__(self) -> None:
-        self.system = platform.system().lower()
+        self.system = _SYSTEM
+
+    @property
+    def backend(self) -> Optional[str]:
+        """Get the clipboard backend in use, or None if unavailable."""
+        return _detect_clipboard_backend()
 
     def copy_to_clipboard(self, text: str) -> bool:
         """
@@ -21,82 +157,57 @@ class ClipboardManager:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            if self.system == "darwin":  # macOS
-                return self._copy_macos(text)
-            elif self.system == "linux":
-                return self._copy_linux(text)
-            elif self.system == "windows":
-                return self._copy_windows(text)
-            else:
-                return False
-        except Exception:
-            return False
+        native = _NATIVE_COPY.get(_SYSTEM)
+        if native is not None:
+            try:
+                if native(text):
+                    return True
+            except Exception:  # nosec B110
+                pass
 
-    def _copy_macos(self, text: str) -> bool:
-        """Copy text to clipboard on macOS."""
-        try:
-            process = subprocess.Popen(  # nosec B603, B607
-                ["pbcopy"],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            process.communicate(input=text.encode("utf-8"))
-            return process.returncode == 0
-        except Exception:
+        backend = self.backend
+        if backend is None:
             return False
-
-    def _copy_linux(self, text: str) -> bool:
-        """Copy text to clipboard on Linux."""
-        # Try xclip first
-        try:
-            process = subprocess.Popen(  # nosec B603, B607
-                ["xclip", "-selection", "clipboard"],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            process.communicate(input=text.encode("utf-8"))
-            if process.returncode == 0:
-                return True
-        except Exception:  # nosec B110
-            pass
-
-        # Try xsel as fallback
         try:
-            process = subprocess.Popen(  # nosec B603, B607
-                ["xsel", "--clipboard", "--input"],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            process.communicate(input=text.encode("utf-8"))
-            return process.returncode == 0
+            return self._COPY[backend](self, text)
         except Exception:
             return False
 
-    def _copy_windows(self, text: str) -> bool:
-        """Copy text to clipboard on Windows."""
-        try:
-            import pyperclip
+    def _copy_pbcopy(self, text: str) -> bool:
+        """Copy text to clipboard with pbcopy."""
+        return _pipe_to(["pbcopy"], text.encode("utf-8"))
 
-            pyperclip.copy(text)
-            return True
-        except ImportError:
-            # Fallback to PowerShell
-            try:
-                process = subprocess.Popen(  # nosec B603, B607
-                    ["powershell", "-command", f'Set-Clipboard -Value "{text}"'],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                )
-                process.communicate()
-                return process.returncode == 0
-            except Exception:
-                return False
-        except Exception:
-            return False
+    def _copy_xclip(self, text: str) -> bool:
+        """Copy text to clipboard with xclip."""
+        return _pipe_to(["xclip", "-selection", "clipboard"], text.encode("utf-8"))
+
+    def _copy_xsel(self, text: str) -> bool:
+        """Copy text to clipboard with xsel."""
+        return _pipe_to(["xsel", "--clipboard", "--input"], text.encode("utf-8"))
+
+    def _copy_pyperclip(self, text: str) -> bool:
+        """Copy text to clipboard with pyperclip."""
+        import pyperclip
+
+        pyperclip.copy(text)
+        return True
+
+    def _copy_powershell(self, text: str) -> bool:
+        """Copy text to clipboard with PowerShell."""
+        # Pass the text on stdin so it is never parsed as PowerShell. It is
+        # sent as UTF-16-LE, Windows' native string encoding, and read in one
+        # piece so line breaks are kept exactly.
+        return _pipe_to(
+            [
+                "powershell",
+                "-NoProfile",
+                "-NonInteractive",
+                "-Command",
+                "[Console]::InputEncoding = [Text.Encoding]::Unicode; "
+                "[Console]::In.ReadToEnd() | Set-Clipboard",
+            ],
+            text.encode("utf-16-le"),
+        )
 
     def get_clipboard_content(self) -> Optional[str]:
         """
@@ -105,75 +216,62 @@ class ClipboardManager:
         Returns:
             Clipboard content or None if failed
         """
-        try:
-            if self.system == "darwin":  # macOS
-                return self._get_macos()
-            elif self.system == "linux":
-                return self._get_linux()
-            elif self.system == "windows":
-                return self._get_windows()
-            else:
-                return None
-        except Exception:
+        backend = self.backend
+        if backend is None:
             return None
-
-    def _get_macos(self) -> Optional[str]:
-        """Get clipboard content on macOS."""
         try:
-            result = subprocess.run(  # nosec B603, B607
-                ["pbpaste"], capture_output=True, text=True, timeout=5
-            )
-            return result.stdout if result.returncode == 0 else None
+            return self._GET[backend](self)
         except Exception:
             return None
 
-    def _get_linux(self) -> Optional[str]:
-        """Get clipboard content on Linux."""
-        # Try xclip first
-        try:
-            result = subprocess.run(  # nosec B603, B607
-                ["xclip", "-selection", "clipboard", "-o"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                return result.stdout
-        except Exception:  # nosec B110
-            pass
-
-        # Try xsel as fallback
-        try:
-            result = subprocess.run(  # nosec B603, B607
-                ["xsel", "--clipboard", "--output"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            return result.stdout if result.returncode == 0 else None
-        except Exception:
-            return None
+    def _get_pbcopy(self) -> Optional[str]:
+        """Get clipboard content with pbpaste."""
+        result = subprocess.run(  # nosec B603, B607
+            ["pbpaste"], capture_output=True, text=True, timeout=CLIPBOARD_TIMEOUT
+        )
+        return result.stdout if result.returncode == 0 else None
 
-    def _get_windows(self) -> Optional[str]:
-        """Get clipboard content on Windows."""
-        try:
-            import pyperclip
+    def _get_xclip(self) -> Optional[str]:
+        """Get clipboard content with xclip."""
+        result = subprocess.run(  # nosec B603, B607
+            ["xclip", "-selection", "clipboard", "-o"],
+            capture_output=True,
+            text=True,
+            timeout=CLIPBOARD_TIMEOUT,
+        )
+        return result.stdout if result.returncode == 0 else None
 
-            return str(pyperclip.paste())
-        except ImportError:
-            # Fallback to PowerShell
-            try:
-                result = subprocess.run(  # nosec B603, B607
-                    ["powershell", "-command", "Get-Clipboard"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                )
-                return result.stdout if result.returncode == 0 else None
-            except Exception:
-                return None
-        except Exception:
-            return None
+    def _get_xsel(self) -> Optional[str]:
+        """Get clipboard content with xsel."""
+        result = subprocess.run(  # nosec B603, B607
+            ["xsel", "--clipboard", "--output"],
+            capture_output=True,
+            text=True,
+            timeout=CLIPBOARD_TIMEOUT,
+        )
+        return result.stdout if result.returncode == 0 else None
+
+    def _get_pyperclip(self) -> Optional[str]:
+        """Get clipboard content with pyperclip."""
+        import pyperclip
+
+        return str(pyperclip.paste())
+
+    def _get_powershell(self) -> Optional[str]:
+        """Get clipboard content with PowerShell."""
+        result = subprocess.run(  # nosec B603, B607
+            [
+                "powershell",
+                "-NoProfile",
+                "-NonInteractive",
+                "-Command",
+                "Get-Clipboard",
+            ],
+            capture_output=True,
+            text=True,
+            timeout=CLIPBOARD_TIMEOUT,
+        )
+        return result.stdout if result.returncode == 0 else None
 
     def is_clipboard_available(self) -> bool:
         """
@@ -182,46 +280,20 @@ class ClipboardManager:
         Returns:
             True if clipboard is available, False otherwise
         """
-        try:
-            if self.system == "darwin":
-                # Check if pbcopy is available
-                subprocess.run(
-                    ["which", "pbcopy"], check=True, capture_output=True
-                )  # nosec B603, B607
-                return True
-            elif self.system == "linux":
-                # Check if xclip or xsel is available
-                try:
-                    subprocess.run(
-                        ["which", "xclip"], check=True, capture_output=True
-                    )  # nosec B603, B607
-                    return True
-                except subprocess.CalledProcessError:
-                    try:
-                        subprocess.run(  # nosec B603, B607
-                            ["which", "xsel"], check=True, capture_output=True
-                        )
-                        return True
-                    except subprocess.CalledProcessError:
-                        return False
-            elif self.system == "windows":
-                # Check if pyperclip is available or PowerShell works
-                try:
-                    import pyperclip  # noqa: F401
+        return self.backend is not None
 
-                    return True
-                except ImportError:
-                    try:
-                        subprocess.run(  # nosec B603, B607
-                            ["powershell", "-command", "Get-Clipboard"],
-                            check=True,
-                            capture_output=True,
-                            timeout=5,
-                        )
-                        return True
-                    except Exception:
-                        return False
-            else:
-                return False
-        except Exception:
-            return False
+    # Implementations keyed by the backend name from _detect_clipboard_backend
+    _COPY: Dict[str, Callable[["ClipboardManager", str], bool]] = {
+        "pbcopy": _copy_pbcopy,
+        "xclip": _copy_xclip,
+        "xsel": _copy_xsel,
+        "pyperclip": _copy_pyperclip,
+        "powershell": _copy_powershell,
+    }
+    _GET: Dict[str, Callable[["ClipboardManager"], Optional[str]]] = {
+        "pbcopy": _get_pbcopy,
+        "xclip": _get_xclip,
+        "xsel": _get_xsel,
+        "pyperclip": _get_pyperclip,
+        "powershell": _get_powershell,
+    }
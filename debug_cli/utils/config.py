@@ -1,15 +1,91 @@
 """Configuration management for the debug CLI."""
 
+import functools
 import os
-from pathlib import Path
+import re
 from typing import Any, Dict, Optional, cast
 
-from dotenv import load_dotenv
+# Values accepted as true by get_bool, compared case-insensitively
+_TRUE_VALUES = frozenset({"true", "1", "yes", "on", "enabled"})
+
+# Parsed .env files by resolved path, empty for files that do not exist
+_ENV_FILES: Dict[str, Dict[str, str]] = {}
+
+# Start of an inline comment after an unquoted .env value
+_INLINE_COMMENT = re.compile(r"\s+#")
+
+# Per-user .env file, read before the one in the current directory
+_HOME_ENV = os.path.join(os.path.expanduser("~"), ".debug-cli", ".env")
+
+# Marks keys whose lookup has not been cached yet, distinct from unset (None)
+_SENTINEL = object()
+
+
+def _parse_env(text: str) -> Dict[str, str]:
+    """
+    Parse the contents of a .env file.
+
+    Supports KEY=value lines, an optional "export " prefix, blank lines,
+    comment lines, inline comments and values wrapped in single or double
+    quotes.
+
+    Args:
+        text: Contents of the .env file
+
+    Returns:
+        Dictionary of the variables defined in the file
+    """
+    values = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("export "):
+            line = line[len("export ") :]
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        value = value.strip()
+        if value[:1] in ("'", '"'):
+            # Quoted values end at the closing quote, ignoring any comment
+            end = value.find(value[0], 1)
+            if end != -1:
+                value = value[1:end]
+        else:
+            # A "#" only starts a comment when preceded by whitespace
+            value = _INLINE_COMMENT.split(value, 1)[0]
+        values[key.strip()] = value
+    return values
+
+
+def _load_env_file(path: str) -> Dict[str, str]:
+    """Read and parse a .env file, once per process."""
+    resolved = os.path.realpath(path)
+    values = _ENV_FILES.get(resolved)
+    if values is None:
+        values = {}
+        if os.path.exists(resolved):
+            with open(resolved, encoding="utf-8") as env_file:
+                values = _parse_env(env_file.read())
+        _ENV_FILES[resolved] = values
+    return values
 
 
 class Config:
     """Configuration manager for the debug CLI."""
 
+    # Settings exposed as cached properties, in to_dict order
+    _FIELDS = (
+        "openai_api_key",
+        "openai_model",
+        "backend_url",
+        "api_timeout",
+        "redis_url",
+        "cache_ttl",
+        "default_explanation_style",
+        "enable_colors",
+    )
+
     def __init__(self, config_file: Optional[str] = None):
         """
         Initialize configuration.
@@ -19,18 +95,26 @@ class Config:
                 directory
         """
         self.config_file = config_file or ".env"
+        self._as_dict: Optional[Dict[str, Any]] = None
+        # Environment values by key, None for keys that are not set
+        self._cache: Dict[str, Optional[str]] = {}
+        # Values from .env files, used for keys not set in the environment
+        self._env: Dict[str, str] = {}
         self._load_config()
 
     def _load_config(self) -> None:
         """Load configuration from environment variables and config file."""
-        # Load from .env file if it exists
-        if Path(self.config_file).exists():
-            load_dotenv(self.config_file)
+        # The .env in the current directory takes precedence over the one in
+        # the home directory; both are overridden by the real environment
+        self._env = {
+            **_load_env_file(_HOME_ENV),
+            **_load_env_file(self.config_file),
+        }
 
-        # Also try loading from home directory
-        home_env = Path.home() / ".debug-cli" / ".env"
-        if home_env.exists():
-            load_dotenv(home_env)
+    @classmethod
+    def reload(cls) -> None:
+        """Allow .env files to be read again by the next Config."""
+        _ENV_FILES.clear()
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -43,7 +127,17 @@ class Config:
         Returns:
             Configuration value or default
         """
-        return os.getenv(key, default)
+        value = self._cache.get(key, _SENTINEL)
+        if value is _SENTINEL:
+            value = self._cache[key] = os.environ.get(key, self._env.get(key))
+        return value if value is not None else default
+
+    def invalidate_cache(self) -> None:
+        """Forget cached values so the next lookups read the environment."""
+        self._cache.clear()
+        self._as_dict = None
+        for name in self._FIELDS:
+            self.__dict__.pop(name, None)
 
     def get_bool(self, key: str, default: bool = False) -> bool:
         """
@@ -56,8 +150,10 @@ class Config:
         Returns:
             Boolean configuration value
         """
-        value = self.get(key, str(default)).lower()
-        return value in ("true", "1", "yes", "on", "enabled")
+        value = self.get(key)
+        if value is None:
+            return default
+        return value.lower() in _TRUE_VALUES
 
     def get_int(self, key: str, default: int = 0) -> int:
         """
@@ -70,8 +166,11 @@ class Config:
         Returns:
             Integer configuration value
         """
+        value = self.get(key)
+        if value is None:
+            return default
         try:
-            return int(self.get(key, str(default)))
+            return int(value)
         except ValueError:
             return default
 
@@ -86,63 +185,60 @@ class Config:
         Returns:
             Float configuration value
         """
+        value = self.get(key)
+        if value is None:
+            return default
         try:
-            return float(self.get(key, str(default)))
+            return float(value)
         except ValueError:
             return default
 
-    @property
+    @functools.cached_property
     def openai_api_key(self) -> Optional[str]:
         """Get OpenAI API key."""
         return cast(Optional[str], self.get("OPENAI_API_KEY"))
 
-    @property
+    @functools.cached_property
     def openai_model(self) -> str:
         """Get OpenAI model to use."""
         return str(self.get("OPENAI_MODEL", "gpt-3.5-turbo"))
 
-    @property
+    @functools.cached_property
     def backend_url(self) -> Optional[str]:
         """Get backend API URL."""
         return cast(Optional[str], self.get("BACKEND_URL"))
 
-    @property
+    @functools.cached_property
     def api_timeout(self) -> int:
         """Get API timeout in seconds."""
         return self.get_int("API_TIMEOUT", 30)
 
-    @property
+    @functools.cached_property
     def redis_url(self) -> Optional[str]:
         """Get Redis URL for caching."""
         return cast(Optional[str], self.get("REDIS_URL"))
 
-    @property
+    @functools.cached_property
     def cache_ttl(self) -> int:
         """Get cache TTL in seconds."""
         return self.get_int("CACHE_TTL", 3600)
 
-    @property
+    @functools.cached_property
     def default_explanation_style(self) -> str:
         """Get default explanation style."""
         return str(self.get("DEFAULT_EXPLANATION_STYLE", "detailed"))
 
-    @property
+    @functools.cached_property
     def enable_colors(self) -> bool:
         """Get whether to enable colored output."""
         return self.get_bool("ENABLE_COLORS", True)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert configuration to dictionary."""
-        return {
-            "openai_api_key": self.openai_api_key,
-            "openai_model": self.openai_model,
-            "backend_url": self.backend_url,
-            "api_timeout": self.api_timeout,
-            "redis_url": self.redis_url,
-            "cache_ttl": self.cache_ttl,
-            "default_explanation_style": self.default_explanation_style,
-            "enable_colors": self.enable_colors,
-        }
+        # Built once; callers get a copy so they can mask or edit values
+        if self._as_dict is None:
+            self._as_dict = {name: getattr(self, name) for name in self._FIELDS}
+        return dict(self._as_dict)
 
     def validate(self) -> Dict[str, str]:
         """
@@ -151,15 +247,30 @@ class Config:
         Returns:
             Dictionary of validation errors (empty if valid)
         """
+        # Read each setting once up front
+        api_key = self.openai_api_key
+        api_timeout = self.api_timeout
+        cache_ttl = self.cache_ttl
         errors = {}
 
-        if not self.openai_api_key:
+        if not api_key:
             errors["openai_api_key"] = "OpenAI API key is required"
 
-        if self.api_timeout <= 0:
+        if api_timeout <= 0:
             errors["api_timeout"] = "API timeout must be positive"
 
-        if self.cache_ttl <= 0:
+        if cache_ttl <= 0:
             errors["cache_ttl"] = "Cache TTL must be positive"
 
         return errors
+
+
+@functools.lru_cache(maxsize=None)
+def get_config() -> Config:
+    """
+    Get the shared configuration, loading it on first use.
+
+    Returns:
+        Config instance shared by the whole process
+    """
+    return Config()
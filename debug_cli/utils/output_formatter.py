@@ -1,17 +1,75 @@
 """Output formatting utilities using Rich."""
 
+import functools
 from typing import List
 
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
 from ..models.explanation import Explanation, FixSuggestion
 
+# Prefix for items in the related errors and prevention tips panels
+BULLET = "• "
+
+# Empty line between panels
+_BLANK = Text("")
+
+# Panel and table titles, styled once instead of parsing markup per render
+_SUMMARY_TITLE = Text.from_markup("[bold blue]Error Summary[/bold blue]")
+_DETAILS_TITLE = Text.from_markup("[bold yellow]Detailed Explanation[/bold yellow]")
+_ROOT_CAUSE_TITLE = Text.from_markup("[bold red]Root Cause[/bold red]")
+# Table titles are not given the table.title style when passed as Text
+_FIXES_TITLE = Text.from_markup(
+    "[bold green]Fix Suggestions[/bold green]", style="table.title"
+)
+_RELATED_ERRORS_TITLE = Text.from_markup("[bold magenta]Related Errors[/bold magenta]")
+_PREVENTION_TIPS_TITLE = Text.from_markup("[bold cyan]Prevention Tips[/bold cyan]")
+_CONFIDENCE_TITLE = Text.from_markup("[bold]Confidence Level[/bold]")
+_ERROR_TITLE = Text.from_markup("[bold red]Error[/bold red]")
+_SUCCESS_TITLE = Text.from_markup("[bold green]Success[/bold green]")
+
+
+# Separator under each explanation header, and between explanations
+_SEP = Text("=" * 50)
+_SEP_BETWEEN = Text("\n" + "=" * 50)
+
+
+def _explanation_header(index: int, count: int) -> str:
+    """Build the header shown above each of several explanations."""
+    return f"\n[bold]Explanation {index} of {count}[/bold]"
+
+
+@functools.lru_cache(maxsize=2)
+def _console(enable_colors: bool) -> Console:
+    """Get the console shared by formatters with the same color setting."""
+    # Building a Console probes the terminal and TERM/COLORTERM/NO_COLOR, so
+    # do it once per setting
+    return Console(force_terminal=enable_colors)
+
+
+# Confidence colors, indexed by how many of the 0.6 and 0.8 thresholds are met
+_COLORS = ("red", "yellow", "green")
+
+
+def _confidence_color(confidence: float) -> str:
+    """Get color for confidence level."""
+    return _COLORS[(confidence >= 0.6) + (confidence >= 0.8)]
+
+
+@functools.lru_cache(maxsize=256)
+def _confidence_markup(confidence: float) -> str:
+    """Get the confidence as a colored percentage in rich markup."""
+    color = _confidence_color(confidence)
+    return f"[{color}]{confidence:.1%}[/{color}]"
+
 
 class OutputFormatter:
     """Handles formatting and displaying explanations in the terminal."""
 
+    __slots__ = ("console",)
+
     def __init__(self, enable_colors: bool = True):
         """
         Initialize the output formatter.
@@ -19,8 +77,13 @@ class OutputFormatter:
         Args:
             enable_colors: Whether to enable colored output
         """
-        self.console = Console(force_terminal=enable_colors)
-        self.enable_colors = enable_colors
+        self.console = _console(enable_colors)
+
+    @property
+    def enable_colors(self) -> bool:
+        """Whether colored output is enabled."""
+        # Consoles are shared per color setting, so compare with the colored one
+        return self.console is _console(True)
 
     def display_explanation(
         self, explanation: Explanation, raw_output: bool = False
@@ -39,143 +102,117 @@ class OutputFormatter:
 
     def _display_formatted_explanation(self, explanation: Explanation) -> None:
         """Display a formatted explanation."""
-        # Summary panel
-        self.console.print()
-        self.console.print(
-            Panel(
-                explanation.summary,
-                title="[bold blue]Error Summary[/bold blue]",
-                border_style="blue",
-            )
-        )
-
-        # Detailed explanation
-        self.console.print()
-        self.console.print(
+        self.console.print(self._build_formatted_explanation(explanation))
+
+    def _build_formatted_explanation(self, explanation: Explanation) -> Group:
+        """Build the renderable for a formatted explanation."""
+        # Summary, detailed explanation and root cause panels
+        parts: List[RenderableType] = [
+            _BLANK,
+            Panel(explanation.summary, title=_SUMMARY_TITLE, border_style="blue"),
+            _BLANK,
             Panel(
                 explanation.detailed_explanation,
-                title="[bold yellow]Detailed Explanation[/bold yellow]",
+                title=_DETAILS_TITLE,
                 border_style="yellow",
-            )
-        )
-
-        # Root cause
-        self.console.print()
-        self.console.print(
-            Panel(
-                explanation.root_cause,
-                title="[bold red]Root Cause[/bold red]",
-                border_style="red",
-            )
-        )
+            ),
+            _BLANK,
+            Panel(explanation.root_cause, title=_ROOT_CAUSE_TITLE, border_style="red"),
+        ]
 
         # Fix suggestions
         if explanation.fix_suggestions:
-            self.console.print()
-            self._display_fix_suggestions(explanation.fix_suggestions)
+            parts.append(_BLANK)
+            parts.extend(self._build_fix_suggestions(explanation.fix_suggestions))
 
         # Related errors
         if explanation.related_errors:
-            self.console.print()
-            self._display_related_errors(explanation.related_errors)
+            parts.append(_BLANK)
+            parts.append(self._build_related_errors(explanation.related_errors))
 
         # Prevention tips
         if explanation.prevention_tips:
-            self.console.print()
-            self._display_prevention_tips(explanation.prevention_tips)
+            parts.append(_BLANK)
+            parts.append(self._build_prevention_tips(explanation.prevention_tips))
 
         # Confidence indicator
-        self.console.print()
-        self._display_confidence(explanation.confidence)
+        parts.append(_BLANK)
+        parts.append(self._build_confidence(explanation.confidence))
+
+        return Group(*parts)
 
     def _display_raw_explanation(self, explanation: Explanation) -> None:
         """Display raw explanation without formatting."""
-        self.console.print(f"Summary: {explanation.summary}")
-        self.console.print(f"Detailed: {explanation.detailed_explanation}")
-        self.console.print(f"Root Cause: {explanation.root_cause}")
+        lines = [
+            f"Summary: {explanation.summary}",
+            f"Detailed: {explanation.detailed_explanation}",
+            f"Root Cause: {explanation.root_cause}",
+        ]
 
         if explanation.fix_suggestions:
-            self.console.print("Fix Suggestions:")
+            lines.append("Fix Suggestions:")
             for i, fix in enumerate(explanation.fix_suggestions, 1):
-                self.console.print(f"  {i}. {fix.description}")
+                lines.append(f"  {i}. {fix.description}")
                 if fix.command:
-                    self.console.print(f"     Command: {fix.command}")
-                self.console.print(f"     Explanation: {fix.explanation}")
-                self.console.print(f"     Confidence: {fix.confidence}")
+                    lines.append(f"     Command: {fix.command}")
+                lines.append(f"     Explanation: {fix.explanation}")
+                lines.append(f"     Confidence: {fix.confidence}")
+
+        lines.append(f"Overall Confidence: {explanation.confidence}")
 
-        self.console.print(f"Overall Confidence: {explanation.confidence}")
+        # Written straight to the output stream: no markup parsing, wrapping
+        # or styling, so the text reaches pipes and scripts exactly as is
+        self.console.file.write("\n".join(lines) + "\n")
 
-    def _display_fix_suggestions(self, fix_suggestions: List[FixSuggestion]) -> None:
-        """Display fix suggestions in a table."""
-        table = Table(title="[bold green]Fix Suggestions[/bold green]")
+    def _build_fix_suggestions(
+        self, fix_suggestions: List[FixSuggestion]
+    ) -> List[RenderableType]:
+        """Build the fix suggestions table and the details panel for each fix."""
+        table = Table(title=_FIXES_TITLE)
         table.add_column("Description", style="cyan")
         table.add_column("Command", style="magenta")
         table.add_column("Confidence", style="green")
 
-        for fix in fix_suggestions:
-            confidence_color = self._get_confidence_color(fix.confidence)
+        # One pass fills the table row and the details panel for each fix
+        parts: List[RenderableType] = [table]
+        for i, fix in enumerate(fix_suggestions, 1):
             table.add_row(
                 fix.description,
                 fix.command or "N/A",
-                f"[{confidence_color}]{fix.confidence:.1%}[/{confidence_color}]",
+                _confidence_markup(fix.confidence),
             )
-
-        self.console.print(table)
-
-        # Display detailed explanations for each fix
-        for i, fix in enumerate(fix_suggestions, 1):
-            self.console.print()
-            self.console.print(
+            parts.append(_BLANK)
+            parts.append(
                 Panel(
                     fix.explanation,
-                    title=f"[bold green]Fix {i} Details[/bold green]",
+                    title=Text.assemble((f"Fix {i} Details", "bold green")),
                     border_style="green",
                 )
             )
 
-    def _display_related_errors(self, related_errors: List[str]) -> None:
-        """Display related errors."""
-        error_list = "\n".join(f"• {error}" for error in related_errors)
-        self.console.print(
-            Panel(
-                error_list,
-                title="[bold magenta]Related Errors[/bold magenta]",
-                border_style="magenta",
-            )
-        )
+        return parts
 
-    def _display_prevention_tips(self, prevention_tips: List[str]) -> None:
-        """Display prevention tips."""
-        tips_list = "\n".join(f"• {tip}" for tip in prevention_tips)
-        self.console.print(
-            Panel(
-                tips_list,
-                title="[bold cyan]Prevention Tips[/bold cyan]",
-                border_style="cyan",
-            )
-        )
+    def _build_related_errors(self, related_errors: List[str]) -> Panel:
+        """Build the related errors panel."""
+        error_list = "\n".join([BULLET + error for error in related_errors])
+        return Panel(error_list, title=_RELATED_ERRORS_TITLE, border_style="magenta")
 
-    def _display_confidence(self, confidence: float) -> None:
-        """Display confidence indicator."""
-        confidence_color = self._get_confidence_color(confidence)
-        confidence_text = f"[{confidence_color}]{confidence:.1%}[/{confidence_color}]"
+    def _build_prevention_tips(self, prevention_tips: List[str]) -> Panel:
+        """Build the prevention tips panel."""
+        tips_list = "\n".join([BULLET + tip for tip in prevention_tips])
+        return Panel(tips_list, title=_PREVENTION_TIPS_TITLE, border_style="cyan")
 
-        self.console.print(
-            Panel(
-                f"Overall Confidence: {confidence_text}",
-                title="[bold]Confidence Level[/bold]",
-                border_style="white",
-            )
+    def _build_confidence(self, confidence: float) -> Panel:
+        """Build the confidence indicator panel."""
+        return Panel(
+            f"Overall Confidence: {_confidence_markup(confidence)}",
+            title=_CONFIDENCE_TITLE,
+            border_style="white",
         )
 
     def _get_confidence_color(self, confidence: float) -> str:
         """Get color for confidence level."""
-        if confidence >= 0.8:
-            return "green"
-        elif confidence >= 0.6:
-            return "yellow"
-        else:
-            return "red"
+        return _confidence_color(confidence)
 
     def display_multiple_explanations(
         self, explanations: List[Explanation], raw_output: bool = False
@@ -187,30 +224,44 @@ class OutputFormatter:
             explanations: List of explanations to display
             raw_output: Whether to display raw output
         """
-        for i, explanation in enumerate(explanations, 1):
-            if len(explanations) > 1:
-                self.console.print(
-                    f"\n[bold]Explanation {i} of {len(explanations)}[/bold]"
-                )
-                self.console.print("=" * 50)
-
-            self.display_explanation(explanation, raw_output)
+        count = len(explanations)
 
-            if i < len(explanations):
-                self.console.print("\n" + "=" * 50)
+        if raw_output:
+            # Raw explanations are written straight to the output stream, so
+            # only the headers and separators go through the console
+            for i, explanation in enumerate(explanations, 1):
+                if count > 1:
+                    self.console.print(_explanation_header(i, count), _SEP, sep="\n")
+                self._display_raw_explanation(explanation)
+                if i < count:
+                    self.console.print(_SEP_BETWEEN)
+            return
+
+        # Formatted explanations are collected and printed in one call
+        renderables: List[RenderableType] = []
+        for i, explanation in enumerate(explanations, 1):
+            if count > 1:
+                renderables.append(_explanation_header(i, count))
+                renderables.append(_SEP)
+            renderables.append(self._build_formatted_explanation(explanation))
+            if i < count:
+                renderables.append(_SEP_BETWEEN)
+        self.console.print(Group(*renderables))
 
     def display_error(self, error_message: str) -> None:
         """Display an error message."""
-        self.console.print()
         self.console.print(
-            Panel(error_message, title="[bold red]Error[/bold red]", border_style="red")
+            Group(
+                _BLANK,
+                Panel(error_message, title=_ERROR_TITLE, border_style="red"),
+            )
         )
 
     def display_success(self, message: str) -> None:
         """Display a success message."""
-        self.console.print()
         self.console.print(
-            Panel(
-                message, title="[bold green]Success[/bold green]", border_style="green"
+            Group(
+                _BLANK,
+                Panel(message, title=_SUCCESS_TITLE, border_style="green"),
             )
         )
@@ -0,0 +1,11 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from debug_cli.core.command_capture import CommandCapture
+
+
+@pytest.fixture(scope="module")
+def capture() -> CommandCapture:
+    """CommandCapture shared by the tests of a module."""
+    return CommandCapture()
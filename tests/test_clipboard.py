@@ -0,0 +1,121 @@
+"""Tests for clipboard utilities."""
+
+import subprocess
+from unittest.mock import patch
+
+from debug_cli.utils import clipboard
+from debug_cli.utils.clipboard import ClipboardManager
+
+
+class TestClipboardManager:
+    """Test ClipboardManager class."""
+
+    def setup_method(self):
+        clipboard._detect_clipboard_backend.cache_clear()
+
+    def teardown_method(self):
+        clipboard._detect_clipboard_backend.cache_clear()
+
+    def test_unsupported_platform(self):
+        """Test that unknown platforms report no clipboard."""
+        manager = ClipboardManager()
+
+        with patch.object(clipboard, "_SYSTEM", "plan9"):
+            assert not manager.is_clipboard_available()
+            assert not manager.copy_to_clipboard("text")
+            assert manager.get_clipboard_content() is None
+
+    def test_copy_dispatches_by_backend(self):
+        """Test that copying calls the implementation for the backend."""
+        manager = ClipboardManager()
+
+        with patch.object(clipboard, "_detect_clipboard_backend", return_value="xsel"):
+            with patch.dict(
+                ClipboardManager._COPY, {"xsel": lambda self, text: text == "hi"}
+            ):
+                assert manager.copy_to_clipboard("hi")
+
+    def test_backend_detected_once(self):
+        """Test that the backend probe is cached across checks."""
+        manager = ClipboardManager()
+
+        with patch.object(clipboard, "_SYSTEM", "linux"):
+            with patch("shutil.which", side_effect=[None, "/usr/bin/xsel"]) as which:
+                assert manager.backend == "xsel"
+                assert manager.is_clipboard_available()
+                assert ClipboardManager().is_clipboard_available()
+
+        assert which.call_count == 2
+
+    def test_windows_backend_without_subprocess(self):
+        """Test that Windows detection does not run PowerShell."""
+        with patch.object(clipboard, "_SYSTEM", "windows"):
+            with patch("importlib.util.find_spec", return_value=None):
+                with patch("shutil.which", return_value="powershell.exe"):
+                    with patch("subprocess.run") as run:
+                        assert ClipboardManager().backend == "powershell"
+
+        run.assert_not_called()
+
+    def test_copy_writes_stdin_without_output_pipes(self):
+        """Test that copy tools get the text on stdin and no output pipes."""
+        with patch.object(clipboard, "_detect_clipboard_backend", return_value="xclip"):
+            with patch("subprocess.run") as run:
+                run.return_value.returncode = 0
+                assert ClipboardManager().copy_to_clipboard("héllo")
+
+        args, kwargs = run.call_args
+        assert args[0] == ["xclip", "-selection", "clipboard"]
+        assert kwargs["input"] == "héllo".encode("utf-8")
+        assert kwargs["stdout"] == subprocess.DEVNULL
+        assert kwargs["stderr"] == subprocess.DEVNULL
+
+    def test_native_copy_falls_back_to_backend(self):
+        """Test that a failed native copy falls back to the external tool."""
+        manager = ClipboardManager()
+
+        with patch.object(clipboard, "_SYSTEM", "darwin"):
+            with patch.object(
+                clipboard, "_detect_clipboard_backend", return_value="xsel"
+            ):
+                with patch.dict(clipboard._NATIVE_COPY, {"darwin": lambda text: True}):
+                    with patch("subprocess.run") as run:
+                        assert manager.copy_to_clipboard("hi")
+                run.assert_not_called()
+
+                with patch.dict(clipboard._NATIVE_COPY, {"darwin": lambda text: False}):
+                    with patch("subprocess.run") as run:
+                        run.return_value.returncode = 0
+                        assert manager.copy_to_clipboard("hi")
+                run.assert_called_once()
+
+    def test_powershell_copy_uses_stdin(self):
+        """Test that PowerShell receives the text on stdin, not in the script."""
+        text = '"; Remove-Item $HOME; "'
+
+        with patch.object(clipboard, "_SYSTEM", "windows"):
+            with patch.object(
+                clipboard, "_detect_clipboard_backend", return_value="powershell"
+            ):
+                with patch.dict(clipboard._NATIVE_COPY, {"windows": lambda t: False}):
+                    with patch("subprocess.run") as run:
+                        run.return_value.returncode = 0
+                        assert ClipboardManager().copy_to_clipboard(text)
+
+        args, kwargs = run.call_args
+        assert "-NoProfile" in args[0]
+        assert all(text not in arg for arg in args[0])
+        assert kwargs["input"] == text.encode("utf-16-le")
+
+    def test_copy_times_out(self):
+        """Test that a hung clipboard tool makes the copy fail, not hang."""
+        with patch.object(clipboard, "_detect_clipboard_backend", return_value="xsel"):
+            with patch(
+                "subprocess.run",
+                side_effect=subprocess.TimeoutExpired(
+                    "xsel", clipboard.CLIPBOARD_TIMEOUT
+                ),
+            ) as run:
+                assert not ClipboardManager().copy_to_clipboard("hi")
+
+        assert run.call_args.kwargs["timeout"] == clipboard.CLIPBOARD_TIMEOUT
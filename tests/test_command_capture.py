@@ -17,10 +17,8 @@ class TestCommandCapture:
         assert "bash" in capture.shell_history_files
         assert "zsh" in capture.shell_history_files
 
-    def test_get_shell_type(self):
+    def test_get_shell_type(self, capture):
         """Test shell type detection."""
-        capture = CommandCapture()
-
         with patch.dict("os.environ", {"SHELL": "/bin/bash"}):
             assert capture.get_shell_type() == "bash"
 
@@ -33,17 +31,20 @@ class TestCommandCapture:
         with patch.dict("os.environ", {"SHELL": "/bin/unknown"}):
             assert capture.get_shell_type() == "unknown"
 
+        with patch.dict("os.environ", {"SHELL": "/opt/notbash/zsh"}):
+            assert capture.get_shell_type() == "zsh"
+
     def test_capture_current_command(self):
         """Test capturing current command."""
-        capture = CommandCapture()
+        with patch.dict("os.environ", {"SHELL": "/bin/bash"}):
+            capture = CommandCapture()
 
         with patch("os.getcwd", return_value="/home/user/project"):
-            with patch.dict("os.environ", {"SHELL": "/bin/bash"}):
-                result = capture.capture_current_command(
-                    command_text="python script.py",
-                    error_output="ModuleNotFoundError: No module named 'script'",
-                    exit_code=1,
-                )
+            result = capture.capture_current_command(
+                command_text="python script.py",
+                error_output="ModuleNotFoundError: No module named 'script'",
+                exit_code=1,
+            )
 
         assert result.command.text == "python script.py"
         assert result.command.working_directory == "/home/user/project"
@@ -52,11 +53,25 @@ class TestCommandCapture:
         assert result.exit_code == 1
         assert not result.is_successful
         assert result.has_error
-
-    def test_get_last_failed_commands(self):
+        assert result.stdout == ""
+        assert result.execution_time is None
+
+    def test_capture_current_command_with_output(self, capture):
+        """Test capturing a command with stdout and execution time."""
+        result = capture.capture_current_command(
+            command_text="make test",
+            error_output="1 failed",
+            exit_code=2,
+            stdout="collected 10 items",
+            execution_time=3.5,
+        )
+
+        assert result.stdout == "collected 10 items"
+        assert result.execution_time == 3.5
+        assert result.exit_code == 2
+
+    def test_get_last_failed_commands(self, capture):
         """Test getting last failed commands."""
-        capture = CommandCapture()
-
         # This tests the mock implementation
         results = capture.get_last_failed_commands(count=2)
 
@@ -64,20 +79,16 @@ class TestCommandCapture:
         assert all(isinstance(result, CommandResult) for result in results)
         assert all(not result.is_successful for result in results)
 
-    def test_get_history_file_path(self):
+    def test_get_history_file_path(self, capture):
         """Test getting history file path."""
-        capture = CommandCapture()
-
         with patch("pathlib.Path.exists", return_value=True):
             with patch("pathlib.Path.home", return_value=Path("/home/user")):
                 path = capture.get_history_file_path("bash")
                 assert path is not None
                 assert "bash_history" in str(path)
 
-    def test_get_history_file_path_not_found(self):
+    def test_get_history_file_path_not_found(self, capture):
         """Test getting history file path when not found."""
-        capture = CommandCapture()
-
         with patch("pathlib.Path.exists", return_value=False):
             path = capture.get_history_file_path("bash")
             assert path is None
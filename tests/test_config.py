@@ -0,0 +1,143 @@
+"""Tests for configuration management."""
+
+import functools
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+from debug_cli.utils import config as config_module
+from debug_cli.utils.config import Config, get_config
+
+
+class TestConfig:
+    """Test Config class."""
+
+    def test_to_dict_returns_copy(self):
+        """Test that callers can edit to_dict output without affecting config."""
+        with patch.dict("os.environ", {"OPENAI_API_KEY": "sk-secret"}):
+            config = Config()
+            masked = config.to_dict()
+            masked["openai_api_key"] = "***"
+
+            assert config.to_dict()["openai_api_key"] == "sk-secret"
+
+    def test_get_caches_environment_lookups(self):
+        """Test that values, including unset keys, are read from env once."""
+        config = Config()
+
+        with patch.dict("os.environ", {"OPENAI_MODEL": "gpt-4"}):
+            assert config.get("OPENAI_MODEL") == "gpt-4"
+            assert config.get("DEBUG_CLI_UNSET", "fallback") == "fallback"
+
+        with patch.dict("os.environ", {"DEBUG_CLI_UNSET": "set later"}):
+            assert config.get("OPENAI_MODEL") == "gpt-4"
+            assert config.get("DEBUG_CLI_UNSET") is None
+
+            config.invalidate_cache()
+            assert config.get("DEBUG_CLI_UNSET") == "set later"
+
+    def test_properties_are_parsed_once(self):
+        """Test that typed properties are cached until invalidated."""
+        with patch.dict("os.environ", {"CACHE_TTL": "60"}):
+            config = Config()
+            with patch.object(config, "get_int", wraps=config.get_int) as get_int:
+                assert config.cache_ttl == 60
+                assert config.cache_ttl == 60
+            get_int.assert_called_once()
+
+        with patch.dict("os.environ", {"CACHE_TTL": "120"}):
+            config.invalidate_cache()
+            assert config.cache_ttl == 120
+
+    def test_get_bool(self):
+        """Test boolean parsing and the default for unset keys."""
+        config = Config()
+
+        with patch.dict("os.environ", {"FLAG_ON": "Yes", "FLAG_OFF": "0"}):
+            assert config.get_bool("FLAG_ON")
+            assert not config.get_bool("FLAG_OFF", True)
+            assert config.get_bool("DEBUG_CLI_UNSET", True)
+
+    def test_get_int_and_float(self):
+        """Test numeric parsing and the default for unset or invalid keys."""
+        config = Config()
+
+        with patch.dict("os.environ", {"NUM": "7", "RATIO": "0.5", "BAD": "x"}):
+            assert config.get_int("NUM") == 7
+            assert config.get_float("RATIO") == 0.5
+            assert config.get_int("BAD", 3) == 3
+            assert config.get_float("BAD", 1.5) == 1.5
+            assert config.get_int("DEBUG_CLI_UNSET", 9) == 9
+            assert config.get_float("DEBUG_CLI_UNSET", 2.5) == 2.5
+
+    def test_env_file_parsed_once(self, tmp_path):
+        """Test that a .env file is parsed once until Config.reload."""
+        env_file = tmp_path / ".env"
+        env_file.write_text("DEBUG_CLI_TEST_VALUE=1\n")
+        Config.reload()
+
+        with patch(
+            "debug_cli.utils.config._parse_env", wraps=config_module._parse_env
+        ) as parse_env:
+            Config(str(env_file))
+            Config(str(env_file))
+            calls = parse_env.call_count
+
+            Config.reload()
+            Config(str(env_file))
+            assert parse_env.call_count == calls * 2
+
+    def test_env_file_values(self, tmp_path):
+        """Test .env parsing and that the real environment takes precedence."""
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            "# comment\n"
+            "export DEBUG_CLI_QUOTED='a = b'\n"
+            'DEBUG_CLI_SHADOWED="from file"\n'
+            "DEBUG_CLI_KEY=sk-abc123  # prod key\n"
+            "DEBUG_CLI_TTL=600\t# ten minutes\n"
+            'DEBUG_CLI_COMMENTED="quoted" # c\n'
+            "DEBUG_CLI_HASH=a#b\n"
+            "not a variable\n"
+        )
+        Config.reload()
+
+        with patch.dict("os.environ", {"DEBUG_CLI_SHADOWED": "from env"}):
+            config = Config(str(env_file))
+
+            assert config.get("DEBUG_CLI_QUOTED") == "a = b"
+            assert config.get("DEBUG_CLI_SHADOWED") == "from env"
+            assert config.get("DEBUG_CLI_KEY") == "sk-abc123"
+            assert config.get_int("DEBUG_CLI_TTL") == 600
+            assert config.get("DEBUG_CLI_COMMENTED") == "quoted"
+            assert config.get("DEBUG_CLI_HASH") == "a#b"
+            assert "DEBUG_CLI_QUOTED" not in os.environ
+
+    def test_to_dict_lists_all_settings(self):
+        """Test that to_dict covers every setting property."""
+        settings = {
+            name
+            for name, attribute in vars(Config).items()
+            if isinstance(attribute, functools.cached_property)
+        }
+
+        assert list(Config().to_dict()) == list(Config._FIELDS)
+        assert set(Config._FIELDS) == settings
+
+    def test_get_config_is_shared(self):
+        """Test that get_config returns one instance per process."""
+        get_config.cache_clear()
+        try:
+            assert get_config() is get_config()
+        finally:
+            get_config.cache_clear()
+
+    def test_loading_config_does_not_import_rich(self):
+        """Test that the utils package defers importing the output formatter."""
+        code = "import sys, debug_cli.utils.config; print('rich' in sys.modules)"
+        result = subprocess.run(  # nosec
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "False"
@@ -0,0 +1,241 @@
+"""Tests for the explanation service."""
+
+import sqlite3
+import stat
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from debug_cli.ai.explanation_service import BATCH_SIZE, ExplanationService
+from debug_cli.models.command import Command, CommandResult
+from debug_cli.models.explanation import Explanation
+
+
+def _make_result(text: str) -> CommandResult:
+    """Build a failed command result for tests."""
+    return CommandResult(
+        command=Command(text=text), stderr=f"{text}: failed", exit_code=1
+    )
+
+
+def _make_explanation(summary: str) -> Explanation:
+    """Build a minimal explanation for tests."""
+    return Explanation(
+        summary=summary,
+        detailed_explanation="details",
+        root_cause="cause",
+        confidence=0.5,
+    )
+
+
+class FakeClient:
+    """Stand-in for OpenAIClient that records batched calls."""
+
+    def __init__(self) -> None:
+        self.batches = []
+
+    def generate_explanation(self, command_result):
+        self.batches.append([command_result.command.text])
+        return _make_explanation(command_result.command.text)
+
+    def generate_explanations_with_batch_api(self, command_results):
+        self.batches.append([r.command.text for r in command_results])
+        return [_make_explanation(r.command.text) for r in command_results]
+
+    async def agenerate_explanations_batch(self, command_results):
+        self.batches.append([r.command.text for r in command_results])
+        return [_make_explanation(r.command.text) for r in command_results]
+
+
+class FailingOnceClient(FakeClient):
+    """Stand-in for OpenAIClient whose first request fails."""
+
+    def generate_explanation(self, command_result):
+        explanation = super().generate_explanation(command_result)
+        if len(self.batches) == 1:
+            explanation.is_fallback = True
+        return explanation
+
+
+class TestExplanationService:
+    """Test ExplanationService class."""
+
+    def _make_service(self) -> ExplanationService:
+        service = ExplanationService()
+        service._openai_client = FakeClient()
+        return service
+
+    def test_explain_multiple_commands_batches_requests(self):
+        """Test that misses are sent in batches and keep input order."""
+        service = self._make_service()
+        results = [_make_result(f"cmd{i}") for i in range(BATCH_SIZE + 2)]
+
+        explanations = service.explain_multiple_commands(results)
+
+        assert [e.summary for e in explanations] == [r.command.text for r in results]
+        assert [len(batch) for batch in service.openai_client.batches] == [
+            BATCH_SIZE,
+            2,
+        ]
+
+    def test_explain_multiple_commands_uses_cache(self):
+        """Test that cached explanations are spliced back in by index."""
+        service = self._make_service()
+        cached = _make_result("cached")
+        service.explain_command(cached)
+        service.openai_client.batches.clear()
+
+        explanations = service.explain_multiple_commands(
+            [_make_result("first"), cached, _make_result("last")]
+        )
+
+        assert [e.summary for e in explanations] == ["first", "cached", "last"]
+        assert service.openai_client.batches == [["first", "last"]]
+
+    def test_cache_key_is_stable(self):
+        """Test that cache keys are deterministic hex digests."""
+        service = self._make_service()
+        key = service._generate_cache_key(_make_result("cmd"))
+
+        assert key == service._generate_cache_key(_make_result("cmd"))
+        assert key != service._generate_cache_key(_make_result("other"))
+        assert len(key) == 32
+        int(key, 16)
+
+    def test_cache_key_with_undecodable_bytes(self):
+        """Test that lone surrogates from non-UTF-8 input can be hashed."""
+        service = self._make_service()
+        key = service._generate_cache_key(_make_result("cat \udcff"))
+
+        assert key == service._generate_cache_key(_make_result("cat \udcff"))
+        assert key != service._generate_cache_key(_make_result("cat \udcfe"))
+
+    def test_openai_client_is_created_lazily(self):
+        """Test that the OpenAI client is not built until first use."""
+        service = ExplanationService()
+        assert service._openai_client is None
+        assert service.get_cache_stats()["cache_size"] == 0
+        assert service._openai_client is None
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the cache is bounded by max_entries."""
+        service = ExplanationService(max_entries=2)
+        service._openai_client = FakeClient()
+        first, second, third = (_make_result(t) for t in ("a", "b", "c"))
+
+        service.explain_command(first)
+        service.explain_command(second)
+        service.explain_command(first)
+        service.explain_command(third)
+
+        assert service._generate_cache_key(first) in service.cache
+        assert service._generate_cache_key(second) not in service.cache
+        assert service.get_cache_stats()["cache_size"] == 2
+
+    def test_cache_entries_expire(self):
+        """Test that expired entries are evicted."""
+        service = ExplanationService(cache_ttl=10)
+        service._openai_client = FakeClient()
+
+        with patch("time.monotonic", return_value=100.0):
+            service.explain_command(_make_result("cmd"))
+        with patch("time.monotonic", return_value=111.0):
+            assert service.get_cache_stats()["valid_entries"] == 0
+
+    def test_explain_multiple_commands_deduplicates(self):
+        """Test that identical commands share a single request and result."""
+        service = self._make_service()
+        duplicate = _make_result("dup")
+
+        explanations = service.explain_multiple_commands(
+            [duplicate, _make_result("other"), _make_result("dup")]
+        )
+
+        assert service.openai_client.batches == [["dup", "other"]]
+        assert explanations[0] is explanations[2]
+
+    def test_persistent_cache_survives_new_service(self, tmp_path):
+        """Test that explanations are reused across service instances."""
+        cache_path = str(tmp_path / "cache.db")
+        first = ExplanationService(persistent_cache=True, cache_path=cache_path)
+        first._openai_client = FakeClient()
+        first.explain_command(_make_result("cmd"))
+
+        second = ExplanationService(persistent_cache=True, cache_path=cache_path)
+        second._openai_client = FakeClient()
+        explanation = second.explain_command(_make_result("cmd"))
+
+        assert explanation.summary == "cmd"
+        assert second.openai_client.batches == []
+        assert second.get_cache_stats()["cache_size"] == 1
+
+    def test_close_releases_disk_cache(self, tmp_path):
+        """Test that close shuts the database connection."""
+        service = ExplanationService(
+            persistent_cache=True, cache_path=str(tmp_path / "cache.db")
+        )
+        service._openai_client = FakeClient()
+        service.explain_command(_make_result("cmd"))
+        connection = service._disk_cache._conn
+
+        service.close()
+        service.close()
+
+        assert service._disk_cache is None
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+
+    def test_fallback_explanations_are_not_cached(self, tmp_path):
+        """Test that a failed request is retried by the next run."""
+        cache_path = str(tmp_path / "cache.db")
+        client = FailingOnceClient()
+
+        for _ in range(2):
+            service = ExplanationService(persistent_cache=True, cache_path=cache_path)
+            service._openai_client = client
+            service.explain_command(_make_result("cmd"))
+            service.close()
+
+        assert client.batches == [["cmd"], ["cmd"]]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+    def test_disk_cache_is_owner_only(self, tmp_path):
+        """Test that the cache directory and database are private to the user."""
+        cache_path = tmp_path / "cache-dir" / "cache.db"
+        service = ExplanationService(persistent_cache=True, cache_path=str(cache_path))
+
+        assert service.disk_cache is not None
+        service.close()
+        assert stat.S_IMODE(cache_path.parent.stat().st_mode) == 0o700
+        assert stat.S_IMODE(cache_path.stat().st_mode) == 0o600
+
+    def test_explain_commands_with_batch_api(self):
+        """Test that only uncached, distinct commands go to the Batch API."""
+        service = self._make_service()
+        cached = _make_result("cached")
+        service.explain_command(cached)
+        service.openai_client.batches.clear()
+
+        explanations = service.explain_commands_with_batch_api(
+            [_make_result("a"), cached, _make_result("a"), _make_result("b")]
+        )
+
+        assert [e.summary for e in explanations] == ["a", "cached", "a", "b"]
+        assert service.openai_client.batches == [["a", "b"]]
+
+    def test_cache_disabled_bypasses_disk_cache(self, tmp_path):
+        """Test that a disabled cache neither reads nor writes the disk cache."""
+        cache_path = str(tmp_path / "cache.db")
+        warm = ExplanationService(persistent_cache=True, cache_path=cache_path)
+        warm._openai_client = FakeClient()
+        warm.explain_command(_make_result("cmd"))
+
+        service = ExplanationService(
+            cache_enabled=False, persistent_cache=True, cache_path=cache_path
+        )
+        service._openai_client = FakeClient()
+        service.explain_command(_make_result("cmd"))
+
+        assert service.openai_client.batches == [["cmd"]]
+        assert service._disk_cache is None
@@ -0,0 +1,64 @@
+"""Tests for the CLI entry point."""
+
+import sys
+from unittest.mock import patch
+
+from debug_cli import __version__
+from debug_cli.__main__ import run
+from debug_cli.main import _combine_explanations_for_clipboard
+from debug_cli.models.explanation import Explanation, FixSuggestion
+
+
+class TestEntryPoint:
+    """Test the console entry point."""
+
+    def test_version_fast_path(self, capsys):
+        """Test that --version is answered without importing the Typer app."""
+        with patch.object(sys, "argv", ["debug", "--version"]):
+            with patch.dict(sys.modules, {"debug_cli.main": None}):
+                run()
+
+        assert capsys.readouterr().out == f"debug-cli version {__version__}\n"
+
+    def test_version_matches_metadata(self):
+        """Test that the version comes from the installed distribution."""
+        from importlib.metadata import version
+
+        assert __version__ == version("debug-cli")
+
+    def test_usage_errors_use_rich_panel(self):
+        """Test that usage errors keep Typer's boxed Rich error panel."""
+        from typer.testing import CliRunner
+
+        from debug_cli.main import app
+
+        result = CliRunner().invoke(app, ["main", "--no-such-option"])
+
+        assert result.exit_code == 2
+        assert "╭─ Error ─" in result.output
+
+
+class TestClipboardText:
+    """Test building the clipboard text."""
+
+    def test_combine_explanations(self):
+        """Test that fixes are numbered and explanations separated."""
+        fix = FixSuggestion(
+            description="Install it", explanation="It is missing", confidence=0.5
+        )
+        explanation = Explanation(
+            summary="Missing package",
+            detailed_explanation="Details",
+            root_cause="Cause",
+            fix_suggestions=[fix],
+            confidence=0.9,
+        )
+
+        single = _combine_explanations_for_clipboard([explanation])
+        combined = _combine_explanations_for_clipboard([explanation, explanation])
+
+        assert "=== Explanation" not in single
+        assert "1. Install it\n   Explanation: It is missing" in single
+        assert "Command:" not in single
+        assert "=== Explanation 2 of 2 ===" in combined
+        assert combined.count("=" * 50) == 1
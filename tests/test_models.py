@@ -2,6 +2,8 @@
 
 from datetime import datetime
 
+import pytest
+
 from debug_cli.models.command import Command, CommandResult
 from debug_cli.models.explanation import Explanation, FixSuggestion
 
@@ -54,6 +56,17 @@ class TestCommandResult:
         assert result.has_error
         assert "can't open file" in result.error_summary
 
+    def test_error_summary_truncates_long_output(self):
+        """Test that only the first three lines of stderr are summarized."""
+        cmd = Command(text="make")
+        stderr = "\n".join(f"line {i}" for i in range(1000))
+        result = CommandResult(command=cmd, stderr=f"  {stderr}\n", exit_code=2)
+
+        assert result.error_summary == "line 0\nline 1\nline 2\n..."
+
+        result.stderr = "one\ntwo\nthree\n"
+        assert result.error_summary == "one\ntwo\nthree"
+
 
 class TestFixSuggestion:
     """Test FixSuggestion model."""
@@ -70,6 +83,11 @@ class TestFixSuggestion:
         assert fix.command == "pip install package"
         assert fix.confidence == 0.9
 
+    def test_fix_suggestion_rejects_invalid_confidence(self):
+        """Test that confidence outside 0-1 is rejected."""
+        with pytest.raises(ValueError):
+            FixSuggestion(description="Fix", explanation="Why", confidence=1.5)
+
 
 class TestExplanation:
     """Test Explanation model."""
@@ -93,6 +111,22 @@ class TestExplanation:
         assert explanation.primary_fix == fix
         assert not explanation.has_high_confidence
 
+    def test_primary_fix_prefers_highest_confidence(self):
+        """Test that the primary fix is the first with the highest confidence."""
+        low, high, tied = (
+            FixSuggestion(description=d, explanation="e", confidence=c)
+            for d, c in (("low", 0.2), ("high", 0.9), ("tied", 0.9))
+        )
+        explanation = Explanation(
+            summary="Test",
+            detailed_explanation="Test",
+            root_cause="Test",
+            fix_suggestions=[low, high, tied],
+            confidence=0.5,
+        )
+
+        assert explanation.primary_fix is high
+
     def test_high_confidence_explanation(self):
         """Test high confidence explanation."""
         explanation = Explanation(
@@ -102,3 +136,15 @@ class TestExplanation:
             confidence=0.9,
         )
         assert explanation.has_high_confidence
+
+
+class TestModelsPackage:
+    """Test the models package exports."""
+
+    def test_lazy_exports(self):
+        """Test that models resolve lazily from the package."""
+        import debug_cli.models as models
+
+        assert models.Explanation is Explanation
+        assert models.CommandResult is CommandResult
+        assert "Explanation" in models.__all__
@@ -0,0 +1,288 @@
+"""Tests for the OpenAI client response handling."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import openai
+
+from debug_cli.ai.explanation_service import BATCH_SIZE
+from debug_cli.ai.openai_client import (
+    MAX_COMPLETION_TOKENS,
+    OpenAIClient,
+    _is_retryable,
+    _JsonStreamBuffer,
+)
+from debug_cli.models.command import Command, CommandResult
+
+EXPLANATION_DATA = {
+    "summary": "Missing {file}",
+    "detailed_explanation": "The file does not exist",
+    "root_cause": "Typo in the file name",
+    "fix_suggestions": [
+        {
+            "description": "Check the name",
+            "command": "ls",
+            "explanation": "Lists files",
+            "confidence": 0.9,
+        }
+    ],
+    "confidence": 0.8,
+}
+
+
+def _make_result(text: str) -> CommandResult:
+    """Build a failed command result for tests."""
+    return CommandResult(command=Command(text=text), stderr="failed", exit_code=1)
+
+
+class FakeStream:
+    """Stand-in for a streamed chat completion."""
+
+    def __init__(self, pieces):
+        self.chunks = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=p))])
+            for p in pieces
+        ]
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAsyncStream(FakeStream):
+    """Stand-in for an asynchronously streamed chat completion."""
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+    async def close(self):
+        self.closed = True
+
+
+class TestOpenAIClient:
+    """Test OpenAIClient response parsing."""
+
+    def test_parse_response(self):
+        """Test parsing a JSON mode response."""
+        client = OpenAIClient(api_key="test-key")
+
+        explanation = client._parse_response(
+            json.dumps(EXPLANATION_DATA), _make_result("cat file")
+        )
+
+        assert explanation.summary == "Missing {file}"
+        assert explanation.primary_fix.command == "ls"
+        assert explanation.confidence == 0.8
+        assert not explanation.is_fallback
+
+    def test_parse_response_invalid_json(self):
+        """Test that unparseable responses fall back gracefully."""
+        client = OpenAIClient(api_key="test-key")
+
+        explanation = client._parse_response("not json", _make_result("cat file"))
+
+        assert explanation.summary == "Unable to generate detailed analysis"
+        assert explanation.is_fallback
+
+    def test_parse_response_rejects_wrong_types(self):
+        """Test that null or mistyped fields fall back instead of rendering."""
+        client = OpenAIClient(api_key="test-key")
+        bad_fields = [
+            {"summary": None},
+            {"root_cause": 42},
+            {"related_errors": "ImportError"},
+            {"prevention_tips": ["ok", None]},
+            {"fix_suggestions": ["not an object"]},
+            {
+                "fix_suggestions": [
+                    {**EXPLANATION_DATA["fix_suggestions"][0], "command": 1}
+                ]
+            },
+        ]
+
+        for fields in bad_fields:
+            explanation = client._parse_response(
+                json.dumps({**EXPLANATION_DATA, **fields}), _make_result("cat file")
+            )
+            assert explanation.summary == "Unable to generate detailed analysis"
+
+    def test_parse_batch_response(self):
+        """Test parsing a batched response with a missing entry."""
+        client = OpenAIClient(api_key="test-key")
+        content = json.dumps({"explanations": [EXPLANATION_DATA]})
+
+        explanations = client._parse_batch_response(
+            content, [_make_result("first"), _make_result("second")]
+        )
+
+        assert explanations[0].summary == "Missing {file}"
+        assert explanations[1].summary == "Unable to generate detailed analysis"
+        assert content not in explanations[1].detailed_explanation
+
+    def test_parse_batch_response_keeps_complete_items(self):
+        """Test that a cut-off batched response keeps its complete items."""
+        client = OpenAIClient(api_key="test-key")
+        content = json.dumps({"explanations": [EXPLANATION_DATA] * 2})[:-30]
+
+        explanations = client._parse_batch_response(
+            content, [_make_result("first"), _make_result("second")]
+        )
+
+        assert explanations[0].summary == "Missing {file}"
+        assert explanations[1].is_fallback
+
+    def test_generate_explanation_retries_transient_errors(self):
+        """Test that connection errors are retried before succeeding."""
+        client = OpenAIClient(api_key="test-key")
+        content = json.dumps(EXPLANATION_DATA)
+        stream = FakeStream([content[:10], content[10:], " trailing tokens"])
+        error = openai.APIConnectionError(
+            request=httpx.Request("POST", "https://api.openai.com")
+        )
+        client.client = MagicMock()
+        client.client.chat.completions.create.side_effect = [error, stream]
+
+        with patch("time.sleep") as sleep:
+            explanation = client.generate_explanation(_make_result("cat file"))
+
+        assert explanation.summary == "Missing {file}"
+        assert client.client.chat.completions.create.call_count == 2
+        sleep.assert_called_once()
+        assert stream.consumed == 2
+        assert stream.closed
+
+    def test_generate_explanation_without_json_mode(self):
+        """Test retrying without response_format for models lacking JSON mode."""
+        client = OpenAIClient(api_key="test-key", model="gpt-4")
+        request = httpx.Request("POST", "https://api.openai.com")
+        error = openai.BadRequestError(
+            "Invalid parameter: 'response_format' of type 'json_object' is not "
+            "supported with this model.",
+            response=httpx.Response(400, request=request),
+            body=None,
+        )
+        stream = FakeStream(["```json\n", json.dumps(EXPLANATION_DATA), "\n```"])
+        client.client = MagicMock()
+        client.client.chat.completions.create.side_effect = [error, stream]
+
+        with patch("time.sleep") as sleep:
+            explanation = client.generate_explanation(_make_result("cat file"))
+
+        first, second = client.client.chat.completions.create.call_args_list
+        assert "response_format" in first.kwargs
+        assert "response_format" not in second.kwargs
+        assert not client.json_mode
+        sleep.assert_not_called()
+        assert explanation.summary == "Missing {file}"
+
+    def test_json_stream_buffer_ignores_braces_in_strings(self):
+        """Test that the stream buffer tracks braces outside strings only."""
+        buffer = _JsonStreamBuffer()
+
+        assert not buffer.feed('{"a": "}\\"{", "b": {')
+        assert buffer.feed('"c": 1}} extra')
+        assert json.loads(buffer.getvalue()) == {"a": '}"{', "b": {"c": 1}}
+
+    def test_generate_explanations_with_batch_api(self):
+        """Test submitting a batch job and mapping its output by custom_id."""
+        client = OpenAIClient(api_key="test-key")
+        client.client = MagicMock()
+        client.client.files.create.return_value = SimpleNamespace(id="file-in")
+        client.client.batches.create.return_value = SimpleNamespace(id="batch-1")
+        client.client.batches.retrieve.side_effect = [
+            SimpleNamespace(status="in_progress", output_file_id=None),
+            SimpleNamespace(status="completed", output_file_id="file-out"),
+        ]
+        record = {
+            "custom_id": "1",
+            "response": {
+                "body": {
+                    "choices": [{"message": {"content": json.dumps(EXPLANATION_DATA)}}]
+                }
+            },
+        }
+        client.client.files.content.return_value = SimpleNamespace(
+            text=json.dumps(record) + "\n"
+        )
+
+        with patch("time.sleep") as sleep:
+            explanations = client.generate_explanations_with_batch_api(
+                [_make_result("first"), _make_result("second")]
+            )
+
+        upload = client.client.files.create.call_args.kwargs
+        assert upload["purpose"] == "batch"
+        assert len(upload["file"][1].splitlines()) == 2
+        sleep.assert_called_once()
+        assert explanations[0].summary == "Unable to generate detailed analysis"
+        assert explanations[1].summary == "Missing {file}"
+
+    def test_batch_max_tokens_within_model_limit(self):
+        """Test that a full batch does not ask for more tokens than allowed."""
+        client = OpenAIClient(api_key="test-key")
+        content = json.dumps({"explanations": [EXPLANATION_DATA] * BATCH_SIZE})
+        client.aclient = MagicMock()
+        client.aclient.chat.completions.create = AsyncMock(
+            return_value=FakeAsyncStream([content])
+        )
+
+        explanations = asyncio.run(
+            client.agenerate_explanations_batch(
+                [_make_result(f"cmd{i}") for i in range(BATCH_SIZE)]
+            )
+        )
+
+        max_tokens = client.aclient.chat.completions.create.call_args.kwargs[
+            "max_tokens"
+        ]
+        assert max_tokens <= MAX_COMPLETION_TOKENS
+        assert [e.summary for e in explanations] == ["Missing {file}"] * BATCH_SIZE
+
+    def test_batch_retries_only_failed_commands(self):
+        """Test that commands missing from a batched response are asked again."""
+        client = OpenAIClient(api_key="test-key")
+        truncated = json.dumps({"explanations": [EXPLANATION_DATA] * 2})[:-30]
+        client.aclient = MagicMock()
+        client.aclient.chat.completions.create = AsyncMock(
+            side_effect=[
+                FakeAsyncStream([truncated]),
+                FakeAsyncStream([json.dumps(EXPLANATION_DATA)]),
+            ]
+        )
+
+        explanations = asyncio.run(
+            client.agenerate_explanations_batch(
+                [_make_result("first"), _make_result("second")]
+            )
+        )
+
+        calls = client.aclient.chat.completions.create.call_args_list
+        assert len(calls) == 2
+        retry_prompt = calls[1].kwargs["messages"][1]["content"]
+        assert "second" in retry_prompt and "first" not in retry_prompt
+        assert [e.summary for e in explanations] == ["Missing {file}"] * 2
+
+    def test_retryable_statuses(self):
+        """Test that the same statuses as the SDK's retry policy are retried."""
+        request = httpx.Request("POST", "https://api.openai.com")
+
+        def status_error(code):
+            return openai.APIStatusError(
+                "error", response=httpx.Response(code, request=request), body=None
+            )
+
+        for code in (408, 409, 429, 500, 503):
+            assert _is_retryable(status_error(code))
+        for code in (400, 401, 404):
+            assert not _is_retryable(status_error(code))
@@ -0,0 +1,101 @@
+"""Tests for output formatting."""
+
+from unittest.mock import patch
+
+from debug_cli.models.explanation import Explanation, FixSuggestion
+from debug_cli.utils.output_formatter import OutputFormatter
+
+
+def _make_explanation() -> Explanation:
+    """Build an explanation with every optional section filled in."""
+    return Explanation(
+        summary="Module not found",
+        detailed_explanation="The module is not installed",
+        root_cause="Missing dependency",
+        fix_suggestions=[
+            FixSuggestion(
+                description="Install it",
+                command="pip install requests",
+                explanation="Installs the package",
+                confidence=0.9,
+            )
+        ],
+        confidence=0.7,
+        related_errors=["ImportError"],
+        prevention_tips=["Use a requirements file"],
+    )
+
+
+def _render(capsys, formatter: OutputFormatter, raw_output: bool = False) -> str:
+    """Display an explanation and return what was written."""
+    formatter.display_explanation(_make_explanation(), raw_output=raw_output)
+    return str(capsys.readouterr().out)
+
+
+class TestOutputFormatter:
+    """Test OutputFormatter class."""
+
+    def test_formatted_explanation(self, capsys):
+        """Test that every section is rendered with its title."""
+        text = _render(capsys, OutputFormatter(enable_colors=False))
+
+        for title in (
+            "Error Summary",
+            "Detailed Explanation",
+            "Root Cause",
+            "Fix Suggestions",
+            "Fix 1 Details",
+            "Related Errors",
+            "Prevention Tips",
+            "Confidence Level",
+        ):
+            assert title in text
+        assert "pip install requests" in text
+        assert "• ImportError" in text
+
+    def test_raw_explanation(self, capsys):
+        """Test the unformatted output used for scripting."""
+        text = _render(capsys, OutputFormatter(enable_colors=False), raw_output=True)
+
+        assert text.startswith("Summary: Module not found\n")
+        assert "     Command: pip install requests\n" in text
+        assert text.endswith("Overall Confidence: 0.7\n")
+
+    def test_confidence_color_thresholds(self):
+        """Test the color boundaries for confidence levels."""
+        formatter = OutputFormatter(enable_colors=False)
+
+        assert formatter._get_confidence_color(0.59) == "red"
+        assert formatter._get_confidence_color(0.6) == "yellow"
+        assert formatter._get_confidence_color(0.79) == "yellow"
+        assert formatter._get_confidence_color(0.8) == "green"
+
+    def test_console_shared_per_color_setting(self):
+        """Test that formatters reuse one console per color setting."""
+        assert OutputFormatter().console is OutputFormatter().console
+        assert (
+            OutputFormatter(enable_colors=False).console
+            is not OutputFormatter(enable_colors=True).console
+        )
+
+    def test_enable_colors_without_instance_dict(self):
+        """Test that the color setting is derived from the shared console."""
+        assert OutputFormatter().enable_colors
+        assert not OutputFormatter(enable_colors=False).enable_colors
+        assert not hasattr(OutputFormatter(), "__dict__")
+
+    def test_multiple_explanations_printed_once(self, capsys):
+        """Test that several formatted explanations go out in one print call."""
+        formatter = OutputFormatter(enable_colors=False)
+        explanations = [_make_explanation(), _make_explanation()]
+
+        with patch.object(
+            formatter.console, "print", wraps=formatter.console.print
+        ) as print_:
+            formatter.display_multiple_explanations(explanations)
+
+        text = capsys.readouterr().out
+        print_.assert_called_once()
+        assert "Explanation 1 of 2" in text
+        assert "Explanation 2 of 2" in text
+        assert text.count("=" * 50) == 3
@@ -0,0 +1,43 @@
+"""Tests for shell integration functionality."""
+
+from unittest.mock import patch
+
+from debug_cli.core import shell_integration
+from debug_cli.core.shell_integration import ShellIntegration
+
+
+class TestShellIntegration:
+    """Test ShellIntegration class."""
+
+    def test_get_recent_commands(self, tmp_path):
+        """Test reading the most recent commands from history."""
+        history = tmp_path / ".bash_history"
+        history.write_text("ls\n# comment\n\ngit status\nmake test\n")
+        integration = ShellIntegration()
+        integration.history_file = history
+
+        assert integration.get_recent_commands(2) == ["git status", "make test"]
+        assert integration.get_recent_commands(10) == ["ls", "git status", "make test"]
+
+    def test_get_recent_commands_grows_window(self, tmp_path):
+        """Test that the tail window grows until enough commands are found."""
+        history = tmp_path / ".zsh_history"
+        lines = [f": 1700000000:0;command {i}" for i in range(50)]
+        history.write_text("\n".join(lines) + "\n")
+        integration = ShellIntegration()
+        integration.history_file = history
+
+        with patch.object(shell_integration, "HISTORY_TAIL_BYTES", 16):
+            recent = integration.get_recent_commands(3)
+
+        assert recent == ["command 47", "command 48", "command 49"]
+
+    def test_get_python_version(self):
+        """Test that the Python version is reported without a subprocess."""
+        integration = ShellIntegration()
+
+        with patch("subprocess.run") as run:
+            version = integration.get_environment_info()["python_version"]
+
+        assert version.startswith("Python 3.")
+        run.assert_not_called()